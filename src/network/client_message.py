@@ -61,36 +61,11 @@ class ClientMessage(ClientBase):
             client_socket.sendall(message.encode('utf-8') + b'\n')
             logger.info(f"Message sent: {message[:100]}...")
             
-            if wait_for_response:
-                # Receive response
-                data = b""
-                while True:
-                    chunk = client_socket.recv(4096)
-                    if not chunk:
-                        break
-                    data += chunk
-                    
-                    # Detect end of reception (ends with newline)
-                    if data.endswith(b'\n'):
-                        break
-                
-                if data:
-                    # Parse JSON response
-                    try:
-                        response = json.loads(data.decode('utf-8').strip())
-                        logger.info("Response received")
-                        client_socket.close()
-                        return response
-                    except json.JSONDecodeError:
-                        logger.warning("Received response is not in JSON format")
-                        client_socket.close()
-                        return data.decode('utf-8').strip()
-                else:
-                    logger.warning("No response received")
+            response = self._receive_response(client_socket) if wait_for_response else None
             
             # Close socket
             client_socket.close()
-            return None
+            return response
             
         except socket.timeout:
             logger.error(f"Connection timeout: {host}:{port}")
@@ -128,6 +103,40 @@ class ClientMessage(ClientBase):
         # Send message
         return self.send_message(host, port, message, wait_for_response)
 
+    def _receive_response(self, client_socket):
+        """
+        Receive a newline-terminated response from the server
+        
+        Args:
+            client_socket (socket.socket): Connected socket
+            
+        Returns:
+            dict, str or None: Parsed JSON response, raw text if not JSON, or None
+        """
+        data = b""
+        while True:
+            chunk = client_socket.recv(4096)
+            if not chunk:
+                break
+            data += chunk
+            
+            # Detect end of reception (ends with newline)
+            if data.endswith(b'\n'):
+                break
+        
+        if not data:
+            logger.warning("No response received")
+            return None
+        
+        # Parse JSON response
+        try:
+            response = json.loads(data.decode('utf-8').strip())
+            logger.info("Response received")
+            return response
+        except json.JSONDecodeError:
+            logger.warning("Received response is not in JSON format")
+            return data.decode('utf-8').strip()
+
     def send_iteration_protocol(self, host, port, protocol_name, data, max_iterations=None, 
                                callback=None, timeout_override=None):
         """
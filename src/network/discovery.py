@@ -49,6 +49,14 @@ class NodeDiscovery:
         self.sock = None
         self.running = False
         
+        # Broadcast destinations, resolved once per discovery run
+        self._broadcast_targets = None
+        
+        # Encoded broadcast message up to the timestamp, and the
+        # (node_id, service_info) it was encoded from
+        self._message_prefix = None
+        self._message_source = None
+        
         # Thread running broadcasts
         self.broadcast_thread = None
         
@@ -66,6 +74,9 @@ class NodeDiscovery:
             return False
         
         try:
+            # Re-resolve broadcast addresses in case interfaces changed
+            self._broadcast_targets = None
+            
             # Create UDP socket
             self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
@@ -188,35 +199,44 @@ class NodeDiscovery:
             return False
         
         try:
-            # Create broadcast message
-            message = {
-                'type': 'node_discovery',
-                'node_id': self.node_id,
-                'service_info': self.service_info,
-                'timestamp': datetime.now().isoformat()
-            }
+            # Create broadcast message; everything but the timestamp is encoded
+            # once per node ID and service_info object
+            source = self._message_source
+            if source is None or source[0] != self.node_id or source[1] is not self.service_info:
+                message = {
+                    'type': 'node_discovery',
+                    'node_id': self.node_id,
+                    'service_info': self.service_info
+                }
+                self._message_prefix = json.dumps(message)[:-1].encode('utf-8') + b', "timestamp": "'
+                self._message_source = (self.node_id, self.service_info)
             
-            # Send broadcast to all available interfaces
-            broadcast_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            broadcast_sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-            data = json.dumps(message).encode('utf-8')
+            data = self._message_prefix + datetime.now().isoformat().encode('ascii') + b'"}'
             
-            # Get broadcast addresses
-            broadcast_addresses = self.get_network_broadcast_addresses()
+            # Resolve the (address, port) targets once; enumerating the
+            # interfaces costs far more than the sends themselves
+            targets = self._broadcast_targets
+            if targets is None:
+                targets = self._broadcast_targets = [
+                    (addr, self.broadcast_port)
+                    for addr in self.get_network_broadcast_addresses()
+                ]
             
-            # Send to all broadcast addresses
+            # Send to all broadcast addresses from the discovery socket,
+            # which already has SO_BROADCAST set
+            sock = self.sock
+            if sock is None:
+                return False
+            sendto = sock.sendto
             success_count = 0
-            for addr in broadcast_addresses:
+            for target in targets:
                 try:
-                    broadcast_sock.sendto(data, (addr, self.broadcast_port))
-                    logger.debug(f"Sent broadcast to {addr}:{self.broadcast_port}")
+                    sendto(data, target)
                     success_count += 1
                 except Exception as e:
-                    logger.debug(f"Failed to broadcast to {addr}: {e}")
-                
-            broadcast_sock.close()
+                    logger.debug(f"Failed to broadcast to {target[0]}: {e}")
             
-            logger.info(f"Broadcasted presence: {self.node_id} (sent to {success_count}/{len(broadcast_addresses)} addresses)")
+            logger.info(f"Broadcasted presence: {self.node_id} (sent to {success_count}/{len(targets)} addresses)")
             return success_count > 0
             
         except Exception as e:
@@ -293,7 +313,8 @@ class NodeDiscovery:
             max_age_minutes (int): Remove information older than this time (minutes)
             
         Returns:
-            dict: Node information dictionary in {node_id: service_info} format
+            dict: Node information dictionary in {node_id: service_info} format,
+                  each service_info copied with a 'last_seen' POSIX timestamp
         """
         current_time = datetime.now()
         max_age = timedelta(minutes=max_age_minutes)
@@ -310,8 +331,8 @@ class NodeDiscovery:
         
         # Return latest node information
         result = {
-            node_id: info 
-            for node_id, (info, _) in self.discovered_nodes.items()
+            node_id: {**info, 'last_seen': last_seen.timestamp()} if isinstance(info, dict) else info
+            for node_id, (info, last_seen) in self.discovered_nodes.items()
         }
         
         logger.debug(f"Current discovered nodes: {len(result)}")
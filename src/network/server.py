@@ -13,6 +13,7 @@ This module includes the following features:
 """
 
 import socket
+import selectors
 import threading
 import logging
 import os
@@ -56,7 +57,8 @@ class Server(ServerBase):
         broadcast_port: int = 8890,
         verify_hash: bool = True,
         project_id: str = None,
-        enable_peer: bool = False
+        enable_peer: bool = False,
+        mode: str = "thread"
     ):
         """
         Server initialization
@@ -74,6 +76,9 @@ class Server(ServerBase):
             verify_hash (bool): Whether to enable src directory hash verification
             project_id (str): Project identifier to which this server belongs
             enable_peer (bool): Whether to enable server-to-server peer communication
+            mode (str): Connection handling mode; "thread" runs handler.handle_client
+                on one thread per client, "selector" serves all clients from a single
+                selector loop using the DefaultHandler message processing
         """
         self.host = host
         self.port = port
@@ -83,6 +88,7 @@ class Server(ServerBase):
         self.clients = {}  # {client_id: (socket, address, thread)}
         self.handler = handler or DefaultHandler()
         self.listen_thread = None
+        self.mode = mode
         
         # Generate server ID if not provided
         self.server_id = server_id or str(uuid.uuid4())
@@ -158,7 +164,11 @@ class Server(ServerBase):
                 self._start_peer()
             
             # Start connection listener thread
-            self.listen_thread = threading.Thread(target=self._listen_for_connections)
+            if self.mode == "selector":
+                listen_target = self._serve_with_selector
+            else:
+                listen_target = self._listen_for_connections
+            self.listen_thread = threading.Thread(target=listen_target)
             self.listen_thread.daemon = True
             self.listen_thread.start()
             
@@ -256,6 +266,122 @@ class Server(ServerBase):
                     self.running = False
                 break
     
+    def _serve_with_selector(self):
+        """
+        Thread function serving every client from a single selector loop
+        
+        Messages are newline-terminated; a header announcing content_length is
+        followed by that many raw bytes. Handlers run on this thread, so a slow
+        handler delays all clients.
+        """
+        logger.info(f"Started selector loop (max {self.max_connections} pending connections)")
+        
+        selector = selectors.DefaultSelector()
+        selector.register(self.server_socket, selectors.EVENT_READ, None)
+        self.server_socket.setblocking(False)
+        
+        # {client_id: [receive buffer, pending header, pending content length]}
+        connections = {}
+        
+        try:
+            while self.running:
+                try:
+                    events = selector.select(timeout=1.0)
+                except OSError:
+                    break
+                
+                for key, _ in events:
+                    if key.data is None:
+                        # New connection on the server socket
+                        try:
+                            client_socket, address = self.server_socket.accept()
+                        except (BlockingIOError, InterruptedError):
+                            continue
+                        except OSError:
+                            if self.running:
+                                logger.error("Connection accept error (server socket closed)")
+                            return
+                        
+                        # Readiness comes from the selector; the timeout only
+                        # bounds how long sending a response may block
+                        client_socket.settimeout(5.0)
+                        client_id = str(uuid.uuid4())
+                        self.clients[client_id] = (client_socket, address, None)
+                        connections[client_id] = [bytearray(), None, 0]
+                        selector.register(client_socket, selectors.EVENT_READ, client_id)
+                        logger.info(f"Client connected: {address[0]}:{address[1]} (ID: {client_id})")
+                        continue
+                    
+                    client_id = key.data
+                    client_socket = key.fileobj
+                    try:
+                        chunk = client_socket.recv(65536)
+                    except (BlockingIOError, InterruptedError):
+                        continue
+                    except OSError:
+                        chunk = b''
+                    
+                    if chunk:
+                        connections[client_id][0] += chunk
+                        try:
+                            if self._process_buffered(client_socket, client_id, connections[client_id]):
+                                continue
+                        except OSError as e:
+                            logger.warning(f"Error sending to client {client_id}: {e}")
+                    
+                    # Client closed the connection or failed
+                    selector.unregister(client_socket)
+                    del connections[client_id]
+                    self._disconnect_client(client_id)
+        finally:
+            selector.close()
+    
+    def _process_buffered(self, client_socket, client_id, connection):
+        """
+        Process every complete message in a client's receive buffer
+        
+        Args:
+            client_socket: Client socket
+            client_id: Unique client ID
+            connection: [receive buffer, pending header, pending content length]
+        
+        Returns:
+            bool: False if the connection must be closed
+        """
+        buffer = connection[0]
+        while True:
+            if connection[1] is None:
+                end = buffer.find(b'\n')
+                if end < 0:
+                    return True
+                data = bytes(buffer[:end])
+                del buffer[:end + 1]
+                
+                # Wait for the raw content announced by the header
+                try:
+                    content_length = self.handler._get_content_length(data)
+                except ValueError as e:
+                    # The stream can't be resynchronized, so give up on it
+                    logger.warning(f"Rejected message from {client_id}: {e}")
+                    client_socket.sendall(self.handler._encode_response(self.handler._content_length_error(e)))
+                    return False
+                if content_length is not None:
+                    connection[1], connection[2] = data, content_length
+                    continue
+                content = None
+            else:
+                content_length = connection[2]
+                if len(buffer) < content_length:
+                    return True
+                data = connection[1]
+                content = bytes(buffer[:content_length])
+                del buffer[:content_length]
+                connection[1] = None
+            
+            response = self.handler._process_message(data, client_id, self, content)
+            if response is not None:
+                client_socket.sendall(self.handler._encode_response(response))
+    
     def _handle_client(self, client_socket, address, client_id):
         """
         Thread for handling individual client connection
@@ -462,6 +588,20 @@ class Server(ServerBase):
         self.register_endpoint(protocol_name, lambda data, client_id: handler_func(data.get('client_address', 'unknown'), data))
         logger.info(f"Protocol handler for '{protocol_name}' registered")
     
+    def register_handlers(self, handlers: Dict[str, Callable]) -> None:
+        """
+        Register several protocol handlers at once
+        
+        Args:
+            handlers (Dict[str, Callable]): Mapping of protocol name to handler function (client_address, data) -> response_data
+        """
+        def wrap(handler_func):
+            return lambda data, client_id: handler_func(data.get('client_address', 'unknown'), data)
+        
+        # Single dict update so the endpoint table changes in one step
+        self.endpoints.update({name: wrap(func) for name, func in handlers.items()})
+        logger.info(f"Protocol handlers registered: {', '.join(handlers)}")
+    
     def get_compatible_peers(self) -> List[Dict[str, Any]]:
         """
         Get list of compatible peers
@@ -34,6 +34,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger("WitchServerHandlers")
 
+# Largest raw content accepted after a message header (bytes); clients
+# check file sizes against the same limit before sending
+MAX_CONTENT_LENGTH = 64 * 1024 * 1024
+
 
 class MediaStreamManager:
     """
@@ -273,6 +277,8 @@ class DefaultHandler:
     Server default handler class
     """
     
+    MAX_CONTENT_LENGTH = MAX_CONTENT_LENGTH
+    
     def __init__(self):
         """
         Initialize default handler
@@ -295,41 +301,54 @@ class DefaultHandler:
         try:
             client_socket.settimeout(None)  # Disable timeout (blocking mode)
             
+            # Bytes received but not yet consumed
+            buffer = bytearray()
+            
             # Client message receiving loop
             while True:
                 try:
-                    # Receive data
-                    data = b""
+                    # Receive data up to the newline that ends the message
+                    scanned = 0
                     while True:
+                        end = buffer.find(b'\n', scanned)
+                        if end >= 0:
+                            break
+                        scanned = len(buffer)
+                        
                         chunk = client_socket.recv(4096)
                         if not chunk:
                             return  # Client closed connection
-                            
-                        data += chunk
-                        
-                        # Receipt complete if ends with newline
-                        if data.endswith(b'\n'):
-                            break
+                        buffer += chunk
+                    
+                    data = bytes(buffer[:end])
+                    del buffer[:end + 1]
+                    
+                    # A header announcing content_length is followed by that
+                    # many raw bytes (see ClientManager._send_pooled in tools/gui_functions.py)
+                    try:
+                        content_length = self._get_content_length(data)
+                    except ValueError as e:
+                        # The stream can't be resynchronized, so give up on it
+                        logger.warning(f"Rejected message from {client_id}: {e}")
+                        client_socket.sendall(self._encode_response(self._content_length_error(e)))
+                        break
                     
-                    # Remove trailing newline
-                    data = data.rstrip(b'\n')
+                    content = None
+                    if content_length is not None:
+                        while len(buffer) < content_length:
+                            chunk = client_socket.recv(65536)
+                            if not chunk:
+                                return  # Client closed connection
+                            buffer += chunk
+                        content = bytes(buffer[:content_length])
+                        del buffer[:content_length]
                     
                     # Process message
-                    response = self._process_message(data, client_id, server)
+                    response = self._process_message(data, client_id, server, content)
                     
                     # Send response
                     if response is not None:
-                        # Encode if string
-                        if isinstance(response, str):
-                            response_data = response.encode('utf-8') + b'\n'
-                        # Byte sequence
-                        elif isinstance(response, bytes):
-                            response_data = response if response.endswith(b'\n') else response + b'\n'
-                        # Otherwise convert to JSON
-                        else:
-                            response_data = json.dumps(response).encode('utf-8') + b'\n'
-                        
-                        client_socket.sendall(response_data)
+                        client_socket.sendall(self._encode_response(response))
                 
                 except ConnectionResetError:
                     logger.info(f"Client reset connection: {client_id}")
@@ -355,7 +374,75 @@ class DefaultHandler:
             except:
                 pass
     
-    def _process_message(self, data, client_id, server):
+    def _encode_response(self, response):
+        """
+        Encode a response as a newline-terminated byte sequence
+        
+        Args:
+            response: Response (str, bytes or JSON-serializable object)
+        
+        Returns:
+            bytes: Encoded response
+        """
+        # Encode if string
+        if isinstance(response, str):
+            return response.encode('utf-8') + b'\n'
+        # Byte sequence
+        if isinstance(response, bytes):
+            return response if response.endswith(b'\n') else response + b'\n'
+        # Otherwise convert to JSON
+        return json.dumps(response).encode('utf-8') + b'\n'
+    
+    def _get_content_length(self, data):
+        """
+        Get the raw content length announced by a message header
+        
+        Only a top-level content_length key next to protocol_name counts;
+        a content_length inside data is an ordinary message field.
+        
+        Args:
+            data: Received message line (bytes)
+        
+        Returns:
+            int or None: Number of raw bytes following the message, or None
+                         if the message announces no content
+        
+        Raises:
+            ValueError: If the announced length is not an integer between 0
+                        and MAX_CONTENT_LENGTH
+        """
+        if not data.startswith(b'{"protocol_name":') or b'"content_length"' not in data:
+            return None
+        
+        try:
+            message = json.loads(data.decode('utf-8'))
+        except ValueError:
+            return None
+        if not isinstance(message, dict) or 'content_length' not in message:
+            return None
+        
+        content_length = message['content_length']
+        if type(content_length) is not int or not 0 <= content_length <= self.MAX_CONTENT_LENGTH:
+            raise ValueError(f"Invalid content_length: {content_length!r}")
+        return content_length
+    
+    def _content_length_error(self, error):
+        """
+        Build the error response for a rejected content_length
+        
+        Args:
+            error: ValueError raised by _get_content_length
+        
+        Returns:
+            dict: Error response
+        """
+        return {
+            'status': 'error',
+            'message': str(error),
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    def _process_message(self, data, client_id, server, content=None):
         """
         Process received message
         
@@ -363,6 +450,7 @@ class DefaultHandler:
             data: Received data (bytes)
             client_id: Client ID
             server: Server instance
+            content: Raw content bytes sent after the message, if any
         
         Returns:
             Response data
@@ -377,6 +465,10 @@ class DefaultHandler:
                     protocol_name = message.get('protocol_name')
                     message_data = message.get('data', {})
                     
+                    # Attach raw content sent after the header
+                    if content is not None:
+                        message_data['content'] = content
+                    
                     if protocol_name:
                         # If protocol_name is specified, look for corresponding endpoint/handler
                         if protocol_name in server.endpoints:
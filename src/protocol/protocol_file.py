@@ -60,13 +60,7 @@ def load_protocol(name_or_path):
         return file_utils.load_json(name_or_path)
     
     # Search by protocol name
-    protocols_dir = _get_protocols_directory()
-    
-    # Add .json extension if not included
-    if not name_or_path.endswith('.json'):
-        name_or_path = f"{name_or_path}.json"
-    
-    file_path = protocols_dir / name_or_path
+    file_path = get_protocol_path(name_or_path)
     
     if not file_path.exists():
         return None
@@ -74,6 +68,23 @@ def load_protocol(name_or_path):
     return file_utils.load_json(str(file_path))
 
 
+def get_protocol_path(name):
+    """
+    Get the definition file path of a protocol in the protocols directory.
+    
+    Args:
+        name (str): Protocol name, with or without the .json extension
+        
+    Returns:
+        Path: Path of the protocol file, which may not exist
+    """
+    # Add .json extension if not included
+    if not name.endswith('.json'):
+        name = f"{name}.json"
+    
+    return _get_protocols_directory() / name
+
+
 def list_available_protocols():
     """
     Get a list of all available protocols.
@@ -23,6 +23,7 @@ from .protocol_core import (
 from .protocol_file import (
     save_protocol,
     load_protocol,
+    get_protocol_path,
     list_available_protocols,
     protocol_to_text,
     export_protocol_to_text_file
@@ -56,6 +57,7 @@ __all__ = [
     # File operations
     'save_protocol',
     'load_protocol',
+    'get_protocol_path',
     'list_available_protocols',
     'protocol_to_text',
     'export_protocol_to_text_file',
@@ -0,0 +1,17 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Witch-Core development tools
+
+Importing the package puts the project root on sys.path once so the tools
+modules can import the witch-core sources.
+"""
+
+import os
+import sys
+
+# Add the project root directory to the path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
@@ -13,13 +13,12 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext, filedialog, messagebox
 import threading
 import json
-import random
-import string
-from datetime import datetime
+from collections import deque
+import secrets
 
-# Add the project root directory to the path
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-sys.path.insert(0, project_root)
+# File dialog filters
+_IMAGE_FILETYPES = (("Image files", "*.jpg *.jpeg *.png *.gif *.bmp"), ("All files", "*.*"))
+_ALL_FILETYPES = (("All files", "*.*"),)
 
 
 class ConsoleOutput(scrolledtext.ScrolledText):
@@ -27,7 +26,7 @@ class ConsoleOutput(scrolledtext.ScrolledText):
     Console output widget with redirected stdout/stderr
     """
     
-    def __init__(self, parent, **kwargs):
+    def __init__(self, parent, max_lines=5000, **kwargs):
         # Set a larger height for the console output (increased from default)
         if 'height' not in kwargs:
             kwargs['height'] = 20  # Increased from typical default of 10-15
@@ -38,22 +37,69 @@ class ConsoleOutput(scrolledtext.ScrolledText):
         # Make the text widget read-only
         self.configure(state='disabled')
         
+        # Hidden writable peer sharing this widget's text, so output can be
+        # inserted without toggling the visible widget's state
+        self._writer = str(self.frame) + '.writer'
+        self.peer_create(self._writer, state='normal')
+        
+        # Maximum number of lines kept in the widget (None for unlimited)
+        self.max_lines = max_lines
+        
+        # Pending text, flushed to the widget once per idle cycle
+        self._buf = deque()
+        self._buf_lock = threading.Lock()
+        self._flush_scheduled = False
+        
+        # Tcl command for _flush, scheduled with a raw "after idle" call so
+        # writes from worker threads are marshalled to the Tk thread
+        self._flush_cmd = self.register(self._flush)
+        
         # Redirect stdout and stderr
         self._stdout = sys.stdout
         self._stderr = sys.stderr
         sys.stdout = self
         sys.stderr = self
+        
+        # Hand stdout/stderr back as soon as the widget goes away
+        self.bind('<Destroy>', lambda e: self.restore())
     
     def write(self, text):
         """Write text to the console"""
-        self.configure(state='normal')
-        self.insert(tk.END, text)
-        self.see(tk.END)
-        self.configure(state='disabled')
+        with self._buf_lock:
+            self._buf.append(text)
+            schedule = not self._flush_scheduled
+            self._flush_scheduled = True
+        if schedule:
+            try:
+                self.tk.call('after', 'idle', self._flush_cmd)
+            except tk.TclError:
+                # Widget or interpreter already destroyed: the text still
+                # reaches the original stdout below
+                pass
         
         # Also write to the original stdout
         self._stdout.write(text)
     
+    def _flush(self):
+        """Insert all pending text into the widget in one operation"""
+        with self._buf_lock:
+            text = ''.join(self._buf)
+            self._buf.clear()
+            self._flush_scheduled = False
+        if not text:
+            return
+        
+        self.tk.call(self._writer, 'insert', tk.END, text)
+        
+        # Drop the oldest lines in one delete once the cap is exceeded
+        if self.max_lines:
+            line_count = int(self.index('end-1c').split('.')[0])
+            excess = line_count - self.max_lines
+            if excess > 0:
+                self.tk.call(self._writer, 'delete', '1.0', f'{excess + 1}.0')
+        
+        self.see(tk.END)
+    
     def flush(self):
         """Flush the console"""
         self._stdout.flush()
@@ -61,9 +107,11 @@ class ConsoleOutput(scrolledtext.ScrolledText):
     
     def reset(self):
         """Clear the console"""
-        self.configure(state='normal')
-        self.delete('1.0', tk.END)
-        self.configure(state='disabled')
+        # Drop tags first so the delete has no tag ranges to fix up
+        tags = [tag for tag in self.tag_names() if tag != 'sel']
+        if tags:
+            self.tag_delete(*tags)
+        self.tk.call(self._writer, 'delete', '1.0', tk.END)
     
     def restore(self):
         """Restore original stdout and stderr"""
@@ -95,13 +143,20 @@ class ServerFrame(ttk.LabelFrame):
         
         # Host
         ttk.Label(config_frame, text="Host:").grid(row=0, column=0, sticky=tk.W)
-        self.host_var = tk.StringVar(value="0.0.0.0")
-        ttk.Entry(config_frame, textvariable=self.host_var).grid(row=0, column=1, sticky=tk.EW)
+        self.host_entry = ttk.Entry(config_frame)
+        self.host_entry.insert(0, "0.0.0.0")
+        self.host_entry.grid(row=0, column=1, sticky=tk.EW)
         
         # Port
         ttk.Label(config_frame, text="Port:").grid(row=0, column=2, padx=(10, 0), sticky=tk.W)
-        self.port_var = tk.StringVar(value="9090")
-        ttk.Entry(config_frame, textvariable=self.port_var, width=8).grid(row=0, column=3, sticky=tk.EW)
+        self.port_var = tk.IntVar(value=9090)
+        ttk.Entry(
+            config_frame, 
+            textvariable=self.port_var, 
+            width=8,
+            validate='key',
+            validatecommand=(self.register(str.isdigit), '%S')
+        ).grid(row=0, column=3, sticky=tk.EW)
         
         # Server ID
         ttk.Label(config_frame, text="Server ID:").grid(row=1, column=0, sticky=tk.W, pady=(5, 0))
@@ -117,13 +172,15 @@ class ServerFrame(ttk.LabelFrame):
         
         # Server Name
         ttk.Label(config_frame, text="Server Name:").grid(row=2, column=0, sticky=tk.W, pady=(5, 0))
-        self.server_name_var = tk.StringVar(value="Witch Server")
-        ttk.Entry(config_frame, textvariable=self.server_name_var).grid(row=2, column=1, columnspan=3, sticky=tk.EW, pady=(5, 0))
+        self.server_name_entry = ttk.Entry(config_frame)
+        self.server_name_entry.insert(0, "Witch Server")
+        self.server_name_entry.grid(row=2, column=1, columnspan=3, sticky=tk.EW, pady=(5, 0))
         
         # Description
         ttk.Label(config_frame, text="Description:").grid(row=3, column=0, sticky=tk.NW, pady=(5, 0))
-        self.description_var = tk.StringVar(value="Witch-Core test server")
-        ttk.Entry(config_frame, textvariable=self.description_var).grid(row=3, column=1, columnspan=3, sticky=tk.EW, pady=(5, 0))
+        self.description_entry = ttk.Entry(config_frame)
+        self.description_entry.insert(0, "Witch-Core test server")
+        self.description_entry.grid(row=3, column=1, columnspan=3, sticky=tk.EW, pady=(5, 0))
         
         # Configure the grid
         config_frame.columnconfigure(1, weight=1)
@@ -159,8 +216,8 @@ class ServerFrame(ttk.LabelFrame):
         self.broadcast_checkbutton.pack(side=tk.RIGHT, padx=5)
     
     def _generate_server_id(self):
-        """Generate a random server ID"""
-        return ''.join(random.choices(string.ascii_lowercase + string.digits, k=8))
+        """Generate a random server ID (8 lowercase hex characters)"""
+        return secrets.token_hex(4)
     
     def _generate_new_id(self):
         """Generate a new server ID and update the UI"""
@@ -169,11 +226,15 @@ class ServerFrame(ttk.LabelFrame):
     def _start_server(self):
         """Start the server"""
         # Get server configuration
-        host = self.host_var.get()
-        port = int(self.port_var.get())
+        host = self.host_entry.get()
+        try:
+            port = self.port_var.get()
+        except tk.TclError:
+            messagebox.showerror("Server Error", "Please enter a valid port number")
+            return
         server_id = self.server_id_var.get()
-        description = self.description_var.get()
-        server_name = self.server_name_var.get()
+        description = self.description_entry.get()
+        server_name = self.server_name_entry.get()
         
         # Start the server
         self.server_manager.start_server(
@@ -194,17 +255,21 @@ class ServerFrame(ttk.LabelFrame):
     
     def _on_server_started(self):
         """Called when the server is started"""
+        # Nothing to do if the UI already shows a running server
+        if self.server_running:
+            return
+        
         # Update UI
-        self.start_button.config(state=tk.DISABLED)
-        self.stop_button.config(state=tk.NORMAL)
+        self.start_button.state(['disabled'])
+        self.stop_button.state(['!disabled'])
         self.server_running = True
         
         # Start auto-broadcast if enabled
         if self.broadcast_var.get():
-            host = self.host_var.get()
-            port = int(self.port_var.get())
+            host = self.host_entry.get()
+            port = self.port_var.get()
             server_id = self.server_id_var.get()
-            server_name = self.server_name_var.get()
+            server_name = self.server_name_entry.get()
             
             self.discovery_manager.start_auto_broadcast(
                 interval=5,  # Broadcast every 5 seconds
@@ -215,9 +280,13 @@ class ServerFrame(ttk.LabelFrame):
     
     def _on_server_stopped(self):
         """Called when the server is stopped"""
+        # Nothing to do if the UI already shows a stopped server
+        if not self.server_running:
+            return
+        
         # Update UI
-        self.start_button.config(state=tk.NORMAL)
-        self.stop_button.config(state=tk.DISABLED)
+        self.start_button.state(['!disabled'])
+        self.stop_button.state(['disabled'])
         self.server_running = False
     
     def _on_server_error(self, error_message):
@@ -253,13 +322,22 @@ class ClientFrame(ttk.LabelFrame):
         
         # Port
         ttk.Label(config_frame, text="Port:").grid(row=0, column=2, padx=(10, 0), sticky=tk.W)
-        self.port_var = tk.StringVar(value="9090")
-        self.port_entry = ttk.Entry(config_frame, textvariable=self.port_var, width=8)
+        self.port_var = tk.IntVar(value=9090)
+        self.port_entry = ttk.Entry(
+            config_frame, 
+            textvariable=self.port_var, 
+            width=8,
+            validate='key',
+            validatecommand=(self.register(str.isdigit), '%S')
+        )
         self.port_entry.grid(row=0, column=3, sticky=tk.EW)
         
         # Server Node
         ttk.Label(config_frame, text="Server:").grid(row=1, column=0, sticky=tk.W, pady=(5, 0))
         self.server_nodes = {}  # Dictionary to store discovered nodes
+        self._nodes_sig = None  # Signature of the nodes shown in the dropdown
+        self._pending_update = None  # after() id of the debounced dropdown update
+        self._label_to_endpoint = {}  # Dropdown label -> (ip, port)
         self.server_var = tk.StringVar()
         self.server_dropdown = ttk.Combobox(
             config_frame, 
@@ -344,71 +422,17 @@ class ClientFrame(ttk.LabelFrame):
         self.text_data_frame.grid(row=2, column=0, columnspan=2, sticky=tk.EW, pady=(5, 0))
         
         ttk.Label(self.text_data_frame, text="Data:").pack(side=tk.LEFT, padx=(0, 5))
-        self.message_data_var = tk.StringVar(value="Hello, Witch!")
-        ttk.Entry(self.text_data_frame, textvariable=self.message_data_var).pack(side=tk.LEFT, fill=tk.X, expand=True)
-        
-        # Number data (initially hidden)
-        self.number_data_frame = ttk.Frame(self.protocol_frame)
-        
-        ttk.Label(self.number_data_frame, text="Number:").pack(side=tk.LEFT, padx=(0, 5))
-        self.number_data_var = tk.DoubleVar(value=0)
-        ttk.Spinbox(
-            self.number_data_frame, 
-            textvariable=self.number_data_var,
-            from_=-1000, 
-            to=1000, 
-            increment=1
-        ).pack(side=tk.LEFT, fill=tk.X, expand=True)
-        
-        # JSON data (initially hidden)
-        self.json_data_frame = ttk.Frame(self.protocol_frame)
-        
-        ttk.Label(self.json_data_frame, text="JSON:").pack(side=tk.TOP, anchor=tk.W)
-        self.json_data_text = scrolledtext.ScrolledText(
-            self.json_data_frame, 
-            height=4, 
-            width=40
-        )
-        self.json_data_text.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-        self.json_data_text.insert(tk.END, '{"key": "value"}')
-        
-        # Image data (initially hidden)
-        self.image_data_frame = ttk.Frame(self.protocol_frame)
-        
-        ttk.Label(self.image_data_frame, text="Image Path:").pack(side=tk.LEFT, padx=(0, 5))
-        self.image_path_var = tk.StringVar()
-        ttk.Entry(self.image_data_frame, textvariable=self.image_path_var).pack(side=tk.LEFT, fill=tk.X, expand=True)
-        ttk.Button(
-            self.image_data_frame, 
-            text="Browse", 
-            command=self._browse_image
-        ).pack(side=tk.LEFT, padx=(5, 0))
-        
-        # File data (initially hidden)
-        self.file_data_frame = ttk.Frame(self.protocol_frame)
-        
-        ttk.Label(self.file_data_frame, text="File Path:").pack(side=tk.LEFT, padx=(0, 5))
-        self.file_path_var = tk.StringVar()
-        ttk.Entry(self.file_data_frame, textvariable=self.file_path_var).pack(side=tk.LEFT, fill=tk.X, expand=True)
-        ttk.Button(
-            self.file_data_frame, 
-            text="Browse", 
-            command=self._browse_file
-        ).pack(side=tk.LEFT, padx=(5, 0))
-        
-        # Image selection (initially hidden)
-        self.image_frame = ttk.Frame(message_frame)
-        self.image_frame.grid(row=1, column=0, columnspan=2, sticky=tk.EW, padx=5, pady=5)
-        self.image_frame.grid_remove()  # Hide initially
-        
-        ttk.Label(self.image_frame, text="Image File:").grid(row=0, column=0, sticky=tk.W)
-        self.image_file_var = tk.StringVar()
-        ttk.Entry(self.image_frame, textvariable=self.image_file_var).grid(row=0, column=1, sticky=tk.EW, padx=(5, 5))
-        ttk.Button(
-            self.image_frame, 
-            text="Browse", 
-            command=self._browse_image_file
-        ).grid(row=0, column=2)
+        self.message_data_entry = ttk.Entry(self.text_data_frame)
+        self.message_data_entry.insert(0, "Hello, Witch!")
+        self.message_data_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        # The other data frames and the image frame are built on first use
+        self._data_frames = {'text': self.text_data_frame}
+        self._current_data_frame = self.text_data_frame
+        self._json_cache = (None, None)  # (raw text, parsed data)
+        self._message_frame = message_frame
+        self.image_frame = None
+        self._current_message_frame = self.protocol_frame
         
         # Configure the grid
         message_frame.columnconfigure(1, weight=1)
@@ -428,72 +452,107 @@ class ClientFrame(ttk.LabelFrame):
         if self.auto_discovery_var.get():
             self._start_auto_discovery()
     
+    def _build_data_frame(self, data_type):
+        """Build the data input frame for a data type on first use"""
+        frame = ttk.Frame(self.protocol_frame)
+        
+        if data_type == "number":
+            ttk.Label(frame, text="Number:").pack(side=tk.LEFT, padx=(0, 5))
+            self.number_data_spinbox = ttk.Spinbox(
+                frame, 
+                from_=-1000, 
+                to=1000, 
+                increment=1
+            )
+            self.number_data_spinbox.set(0)
+            self.number_data_spinbox.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        elif data_type == "json":
+            ttk.Label(frame, text="JSON:").pack(side=tk.TOP, anchor=tk.W)
+            self.json_data_text = scrolledtext.ScrolledText(
+                frame, 
+                height=4, 
+                width=40
+            )
+            self.json_data_text.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+            self.json_data_text.insert(tk.END, '{"key": "value"}')
+        elif data_type == "image":
+            ttk.Label(frame, text="Image Path:").pack(side=tk.LEFT, padx=(0, 5))
+            self.image_path_var = tk.StringVar()
+            ttk.Entry(frame, textvariable=self.image_path_var).pack(side=tk.LEFT, fill=tk.X, expand=True)
+            ttk.Button(
+                frame, 
+                text="Browse", 
+                command=lambda: self._browse_into(self.image_path_var)
+            ).pack(side=tk.LEFT, padx=(5, 0))
+        elif data_type == "file":
+            ttk.Label(frame, text="File Path:").pack(side=tk.LEFT, padx=(0, 5))
+            self.file_path_var = tk.StringVar()
+            ttk.Entry(frame, textvariable=self.file_path_var).pack(side=tk.LEFT, fill=tk.X, expand=True)
+            ttk.Button(
+                frame, 
+                text="Browse", 
+                command=lambda: self._browse_into(self.file_path_var, "Select File", _ALL_FILETYPES)
+            ).pack(side=tk.LEFT, padx=(5, 0))
+        
+        self._data_frames[data_type] = frame
+        return frame
+    
+    def _build_image_frame(self):
+        """Build the direct image transfer frame on first use"""
+        self.image_frame = ttk.Frame(self._message_frame)
+        
+        ttk.Label(self.image_frame, text="Image File:").grid(row=0, column=0, sticky=tk.W)
+        self.image_file_var = tk.StringVar()
+        ttk.Entry(self.image_frame, textvariable=self.image_file_var).grid(row=0, column=1, sticky=tk.EW, padx=(5, 5))
+        ttk.Button(
+            self.image_frame, 
+            text="Browse", 
+            command=lambda: self._browse_into(self.image_file_var)
+        ).grid(row=0, column=2)
+        
+        return self.image_frame
+    
     def _toggle_message_type(self):
         """Toggle between protocol and image message types"""
-        message_type = self.message_type_var.get()
+        if self.message_type_var.get() == "image":
+            new = self.image_frame or self._build_image_frame()
+        else:
+            new = self.protocol_frame
         
-        if message_type == "protocol":
-            self.protocol_frame.grid()
-            self.image_frame.grid_remove()
-        elif message_type == "image":
-            self.protocol_frame.grid_remove()
-            self.image_frame.grid()
+        # Only swap frames when the selection actually changed
+        if new is self._current_message_frame:
+            return
+        self._current_message_frame.grid_remove()
+        new.grid(row=1, column=0, columnspan=2, sticky=tk.EW, padx=5, pady=5)
+        self._current_message_frame = new
     
     def _on_data_type_selected(self, event=None):
         """Handle data type selection"""
         data_type = self.data_type_var.get()
+        new = self._data_frames.get(data_type) or self._build_data_frame(data_type)
         
-        # Hide all data frames
-        self.text_data_frame.grid_remove()
-        self.number_data_frame.grid_remove()
-        self.json_data_frame.grid_remove()
-        self.image_data_frame.grid_remove()
-        self.file_data_frame.grid_remove()
-        
-        # Show the selected data frame
-        if data_type == "text":
-            self.text_data_frame.grid(row=2, column=0, columnspan=2, sticky=tk.EW, pady=(5, 0))
-        elif data_type == "number":
-            self.number_data_frame.grid(row=2, column=0, columnspan=2, sticky=tk.EW, pady=(5, 0))
-        elif data_type == "json":
-            self.json_data_frame.grid(row=2, column=0, columnspan=2, sticky=tk.EW, pady=(5, 0))
-        elif data_type == "image":
-            self.image_data_frame.grid(row=2, column=0, columnspan=2, sticky=tk.EW, pady=(5, 0))
-        elif data_type == "file":
-            self.file_data_frame.grid(row=2, column=0, columnspan=2, sticky=tk.EW, pady=(5, 0))
-    
-    def _browse_image(self):
-        """Browse for an image file"""
-        file_path = filedialog.askopenfilename(
-            title="Select Image",
-            filetypes=[
-                ("Image files", "*.jpg *.jpeg *.png *.gif *.bmp"),
-                ("All files", "*.*")
-            ]
-        )
-        if file_path:
-            self.image_path_var.set(file_path)
-    
-    def _browse_file(self):
-        """Browse for any file"""
-        file_path = filedialog.askopenfilename(
-            title="Select File",
-            filetypes=[("All files", "*.*")]
-        )
-        if file_path:
-            self.file_path_var.set(file_path)
-    
-    def _browse_image_file(self):
-        """Browse for an image file for direct image transfer"""
+        # Only swap frames when the selection actually changed
+        if new is self._current_data_frame:
+            return
+        self._current_data_frame.grid_remove()
+        new.grid(row=2, column=0, columnspan=2, sticky=tk.EW, pady=(5, 0))
+        self._current_data_frame = new
+    
+    def _browse_into(self, var, title="Select Image", filetypes=_IMAGE_FILETYPES):
+        """
+        Browse for a file and store the chosen path
+        
+        Args:
+            var: StringVar that receives the selected path
+            title: Dialog title
+            filetypes: File type filters shown in the dialog
+        """
         file_path = filedialog.askopenfilename(
-            title="Select Image",
-            filetypes=[
-                ("Image files", "*.jpg *.jpeg *.png *.gif *.bmp"),
-                ("All files", "*.*")
-            ]
+            title=title,
+            filetypes=filetypes
         )
         if file_path:
-            self.image_file_var.set(file_path)
+            var.set(file_path)
     
     def _discover_nodes(self):
         """Discover nodes on the network"""
@@ -516,16 +575,34 @@ class ClientFrame(ttk.LabelFrame):
         )
     
     def _update_server_nodes(self, nodes):
+        """Schedule a server nodes dropdown update, merging bursts within 100ms"""
+        if self._pending_update is not None:
+            self.after_cancel(self._pending_update)
+        self._pending_update = self.after(100, self._apply_nodes, nodes)
+    
+    def _apply_nodes(self, nodes):
         """Update the server nodes dropdown"""
+        self._pending_update = None
         self.server_nodes = nodes
         
+        # Skip the dropdown update when the displayed data has not changed
+        entries = [
+            (info.get('server_name', 'anonymous'),
+             info.get('local_ip') or info.get('host', 'unknown'),
+             info.get('port', '?'))
+            for info in nodes.values()
+        ]
+        sig = tuple(sorted(entries, key=str))
+        if sig == self._nodes_sig:
+            return
+        self._nodes_sig = sig
+        
         # Update the dropdown
-        node_names = []
-        for node_id, info in nodes.items():
-            server_name = info.get('server_name', 'anonymous')
-            ip = info.get('local_ip', info.get('host', 'unknown'))
-            port = info.get('port', '?')
-            node_names.append(f"{server_name} ({ip}:{port})")
+        node_names = ["%s (%s:%s)" % entry for entry in entries]
+        self._label_to_endpoint = {
+            label: (ip, str(port))
+            for label, (_, ip, port) in zip(node_names, entries)
+        }
         
         # Update the dropdown values
         self.server_dropdown['values'] = tuple(node_names)
@@ -537,33 +614,25 @@ class ClientFrame(ttk.LabelFrame):
     
     def _on_server_selected(self, event=None):
         """Handle server selection"""
-        selected = self.server_var.get()
-        if not selected:
+        # Labels are produced by _apply_nodes, so the endpoint is
+        # looked up instead of parsed back out of the label
+        endpoint = self._label_to_endpoint.get(self.server_var.get())
+        if not endpoint:
             return
         
-        # Extract the node details
-        try:
-            # Parse the selected node
-            # Format: "server_name (ip:port)"
-            import re
-            match = re.match(r"(.*) \((.+):(\d+)\)$", selected)
-            if not match:
-                return
-                
-            server_name, ip, port = match.groups()
-            
-            # Update the host and port fields
-            self.host_var.set(ip)
-            self.port_var.set(port)
-            
-        except Exception as e:
-            print(f"Error parsing server selection: {e}")
+        # Update the host and port fields
+        self.host_var.set(endpoint[0])
+        self.port_var.set(endpoint[1])
     
     def _send_message(self):
         """Send a message to the server"""
         # Get client configuration
         host = self.host_var.get()
-        port = int(self.port_var.get())
+        try:
+            port = self.port_var.get()
+        except tk.TclError:
+            messagebox.showerror("Message Error", "Please enter a valid port number")
+            return
         
         # Check message type
         message_type = self.message_type_var.get()
@@ -575,53 +644,83 @@ class ClientFrame(ttk.LabelFrame):
             # Get data based on type
             data_type = self.data_type_var.get()
             data = {}
+            file_check = None
             
             if data_type == "text":
-                data = {"message": self.message_data_var.get()}
+                data = {"message": self.message_data_entry.get()}
             elif data_type == "number":
-                data = {"value": self.number_data_var.get()}
+                data = {"value": float(self.number_data_spinbox.get())}
             elif data_type == "json":
-                try:
-                    json_text = self.json_data_text.get("1.0", tk.END).strip()
-                    data = json.loads(json_text)
-                except json.JSONDecodeError as e:
-                    messagebox.showerror("JSON Error", f"Invalid JSON: {e}")
-                    return
+                json_text = self.json_data_text.get("1.0", tk.END).strip()
+                
+                # Reuse the last parse when the JSON text hasn't changed
+                if json_text == self._json_cache[0]:
+                    data = self._json_cache[1]
+                else:
+                    try:
+                        data = json.loads(json_text)
+                    except json.JSONDecodeError as e:
+                        messagebox.showerror("JSON Error", f"Invalid JSON: {e}")
+                        return
+                    self._json_cache = (json_text, data)
             elif data_type == "image":
                 image_path = self.image_path_var.get()
-                if not os.path.isfile(image_path):
-                    messagebox.showerror("File Error", "Invalid image file path")
-                    return
+                file_check = (image_path, "File Error", "Invalid image file path")
                 data = {"image_path": image_path}
             elif data_type == "file":
                 file_path = self.file_path_var.get()
-                if not os.path.isfile(file_path):
-                    messagebox.showerror("File Error", "Invalid file path")
-                    return
+                file_check = (file_path, "File Error", "Invalid file path")
                 data = {"file_path": file_path}
             
             # Send the message
-            self.client_manager.send_message(
+            send = lambda: self.client_manager.send_message(
                 host, port, protocol, data,
                 discover=False,  # We're connecting directly
                 on_success=self._on_message_sent,
                 on_error=self._on_message_error
             )
             
+            if file_check:
+                self._send_if_file_exists(*file_check, send)
+            else:
+                send()
+            
         elif message_type == "image":
             # Get the image file
             image_file = self.image_file_var.get()
             
-            if not image_file or not os.path.isfile(image_file):
+            if not image_file:
                 messagebox.showerror("Image Error", "Please select a valid image file")
                 return
             
             # Send the image
-            self.client_manager.send_image(
+            send = lambda: self.client_manager.send_image(
                 host, port, image_file,
                 on_success=self._on_message_sent,
                 on_error=self._on_message_error
             )
+            self._send_if_file_exists(image_file, "Image Error", "Please select a valid image file", send)
+    
+    def _send_if_file_exists(self, path, error_title, error_message, send):
+        """
+        Check that a file exists on a worker thread, then send
+        
+        The existence check can block on slow or network filesystems, so it
+        runs off the Tk thread. Errors are shown back on the Tk thread.
+        
+        Args:
+            path: Path of the file to check
+            error_title: Title of the error dialog if the file is missing
+            error_message: Message of the error dialog if the file is missing
+            send: Callable that performs the send
+        """
+        def check_and_send():
+            if os.path.isfile(path):
+                send()
+            else:
+                self.after(0, messagebox.showerror, error_title, error_message)
+        
+        threading.Thread(target=check_and_send, daemon=True).start()
     
     def _on_message_sent(self, response):
         """Called when a message is successfully sent"""
@@ -661,13 +760,15 @@ class ProtocolFrame(ttk.LabelFrame):
         
         # Protocol name
         ttk.Label(create_frame, text="Name:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
-        self.name_var = tk.StringVar(value="my_protocol")
-        ttk.Entry(create_frame, textvariable=self.name_var).grid(row=0, column=1, sticky=tk.EW, padx=5, pady=5)
+        self.name_entry = ttk.Entry(create_frame)
+        self.name_entry.insert(0, "my_protocol")
+        self.name_entry.grid(row=0, column=1, sticky=tk.EW, padx=5, pady=5)
         
         # Protocol number
         ttk.Label(create_frame, text="Number:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=5)
-        self.number_var = tk.StringVar(value="100")
-        ttk.Entry(create_frame, textvariable=self.number_var).grid(row=1, column=1, sticky=tk.EW, padx=5, pady=5)
+        self.number_entry = ttk.Entry(create_frame)
+        self.number_entry.insert(0, "100")
+        self.number_entry.grid(row=1, column=1, sticky=tk.EW, padx=5, pady=5)
         
         # Protocol data fields
         ttk.Label(create_frame, text="Data Fields:").grid(row=2, column=0, sticky=tk.NW, padx=5, pady=5)
@@ -692,13 +793,12 @@ class ProtocolFrame(ttk.LabelFrame):
     def _create_protocol(self):
         """Create a new protocol"""
         # Get protocol configuration
-        name = self.name_var.get()
-        number = self.number_var.get()
+        name = self.name_entry.get()
+        number = self.number_entry.get()
         
         # Parse data fields
         data_fields_text = self.data_fields_text.get("1.0", tk.END).strip()
-        data_fields = data_fields_text.split("\n")
-        data_fields = [field.strip() for field in data_fields if field.strip()]
+        data_fields = [field for field in (line.strip() for line in data_fields_text.splitlines()) if field]
         
         # Create the protocol
         self.protocol_manager.create_protocol(
@@ -10,20 +10,21 @@ It handles server and client operations, discovery, and protocol management.
 
 import os
 import sys
-import json
 import time
+import queue
+import select
+import socket
 import threading
+import concurrent.futures
+import functools
+import logging
 from datetime import datetime
-import traceback
-
-# Add the project root directory to the path
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-sys.path.insert(0, project_root)
+import orjson
 
 # Import witch-core modules
 try:
     from src.network.server import Server
-    from src.network.client import Client
+    from src.network.server_handlers import MAX_CONTENT_LENGTH
     from src.network.discovery import discover_nodes, broadcast_presence
     from src.protocol import protocol_manager
     from src.utils import file_utils, register_server, get_server_registry, get_servers_by_port
@@ -31,6 +32,64 @@ except ImportError as e:
     print(f"Error importing witch-core modules: {e}")
     sys.exit(1)
 
+# Logger configuration; the discovery and broadcast loops log per cycle, so
+# the level defaults to WARNING and can be raised with WITCH_LOGLEVEL
+logger = logging.getLogger("WitchGUI")
+try:
+    logger.setLevel(os.environ.get('WITCH_LOGLEVEL', 'WARNING').upper())
+except ValueError:
+    # Unknown level name; keep the default rather than failing the import
+    logger.setLevel(logging.WARNING)
+
+
+def _log_exc(msg, hints=None):
+    """
+    Log the exception being handled, with optional troubleshooting hints
+    
+    Args:
+        msg: Error message
+        hints: Troubleshooting lines, only emitted when INFO is enabled
+    """
+    logger.exception(msg)
+    if hints and logger.isEnabledFor(logging.INFO):
+        for hint in hints:
+            logger.info(hint)
+
+
+# Protocols served by the GUI tester server
+_SUPPORTED_PROTOCOLS = ('example_protocol', 'text_data', 'json_data', 'image_data', 'file_data')
+
+
+@functools.lru_cache(maxsize=8)
+def _make_service_info(port, server_name):
+    """
+    Build the service information broadcast for node discovery
+    
+    The same dict is returned for the same arguments, so the discovery layer
+    can reuse its encoded broadcast message across cycles. Do not modify it.
+    """
+    return {
+        'type': 'witch-series-server',
+        'port': port,
+        'protocols': _SUPPORTED_PROTOCOLS,
+        'server_name': server_name
+    }
+
+
+def _save_json(path, obj):
+    """
+    Save an object to an indented JSON file
+    
+    orjson encodes straight to bytes in C, so the file is written with a
+    single write call.
+    
+    Args:
+        path: Destination file path
+        obj: JSON-serializable object
+    """
+    with open(path, 'wb') as f:
+        f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+
 
 class ServerManager:
     """Manages server operations"""
@@ -38,6 +97,15 @@ class ServerManager:
     def __init__(self):
         self.server = None
         self.server_running = False
+        self._io_pool = None  # Writes received payloads to disk off the handler thread
+    
+    def _persist(self, obj, filename):
+        """Save a received payload to the tmp directory"""
+        try:
+            _save_json(file_utils._get_tmp_directory() / filename, obj)
+            print(f"Data saved to {filename}")
+        except Exception:
+            _log_exc(f"Error saving {filename}")
         
     def start_server(self, host, port, server_id, description, server_name="anonymous"):
         """Start a server with the given parameters"""
@@ -45,77 +113,64 @@ class ServerManager:
             print(f"Starting server '{server_name}' ({host}:{port}, ID: {server_id})...")
             
             # Initialize server
-            self.server = Server(host=host, port=port)
+            self.server = Server(host=host, port=port, mode='selector')
+            
+            if self._io_pool is None:
+                self._io_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+            io_pool = self._io_pool
+            
+            # Fixed part of every handler response
+            base_response = {
+                'status': 'success',
+                'message': 'Data received',
+                'server_name': server_name
+            }
             
             # Register test protocol handler
             def example_handler(client_address, data):
-                print(f"Received data from client {client_address}: {data}")
+                # Raw file content can be tens of MB, so only its size is shown
+                if 'content' in data:
+                    summary = {k: v for k, v in data.items() if k != 'content'}
+                    print(f"Received data from client {client_address}: {summary} "
+                          f"(+{len(data['content'])} bytes of content)")
+                else:
+                    print(f"Received data from client {client_address}: {data}")
                 
-                # Save received data to tmp directory
+                # Save received data to tmp directory without holding up the response
                 if 'data' in data:
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                    timestamp = time.strftime("%Y%m%d_%H%M%S")
                     filename = f"received_{timestamp}.json"
-                    file_utils.save_to_tmp(filename, json.dumps(data['data'], indent=2))
-                    print(f"Data saved to {filename}")
+                    io_pool.submit(self._persist, data['data'], filename)
                 
                 # Create response
-                response = {
-                    'status': 'success',
-                    'message': 'Data received',
-                    'timestamp': datetime.now().isoformat(),
-                    'server_name': server_name
-                }
-                
-                return response
+                return {**base_response, 'timestamp': datetime.now().isoformat()}
             
             # Register handler for various data types
-            self.server.register_handler('example_protocol', example_handler)
-            self.server.register_handler('text_data', example_handler)
-            self.server.register_handler('json_data', example_handler)
-            self.server.register_handler('image_data', example_handler)
-            self.server.register_handler('file_data', example_handler)
+            self.server.register_handlers({name: example_handler for name in _SUPPORTED_PROTOCOLS})
             
             # Start server
             if self.server.start():
                 self.server_running = True
                 
-                # Supported protocols
-                supported_protocols = [
-                    'example_protocol', 
-                    'text_data', 
-                    'json_data', 
-                    'image_data', 
-                    'file_data'
-                ]
-                
                 # Register server information in the registry
                 register_server(
                     server_id=server_id,
                     port=port,
                     host=host,
-                    protocol_names=supported_protocols,
+                    protocol_names=_SUPPORTED_PROTOCOLS,
                     description=description
                 )
                 
-                # Service information for node discovery
-                service_info = {
-                    'type': 'witch-series-server',
-                    'port': port,
-                    'protocols': supported_protocols,
-                    'server_name': server_name
-                }
-                
                 # Broadcast presence
-                broadcast_presence(node_id=server_id, service_info=service_info)
+                broadcast_presence(node_id=server_id, service_info=_make_service_info(port, server_name))
                 
                 print(f"Server '{server_name}' started and waiting for client connections...")
                 return True
             else:
                 print("Failed to start server")
                 return False
-        except Exception as e:
-            print(f"Error starting server: {e}")
-            traceback.print_exc()
+        except Exception:
+            _log_exc("Error starting server")
             return False
     
     def stop_server(self):
@@ -124,6 +179,11 @@ class ServerManager:
             print("Stopping server...")
             self.server.stop()
             self.server_running = False
+            
+            # Let pending payload writes finish
+            if self._io_pool is not None:
+                self._io_pool.shutdown(wait=True)
+                self._io_pool = None
             print("Server stopped")
             return True
         return False
@@ -132,8 +192,155 @@ class ServerManager:
 class ClientManager:
     """Manages client operations"""
     
+    # Maximum number of idle connections kept per (host, port)
+    POOL_SIZE = 25
+    
     def __init__(self):
-        self.client = Client()
+        self._pool = {}  # (host, port) -> queue.Queue of idle sockets
+        self._pool_lock = threading.Lock()
+    
+    def _borrow(self, host, port):
+        """Take an idle connection to host:port from the pool, or open a new one"""
+        with self._pool_lock:
+            pool = self._pool.setdefault((host, port), queue.Queue(maxsize=self.POOL_SIZE))
+        while True:
+            try:
+                sock = pool.get_nowait()
+            except queue.Empty:
+                break
+            # The server never writes to an idle connection, so a readable
+            # one has been closed (or reset) since it was pooled
+            if select.select([sock], [], [], 0)[0]:
+                sock.close()
+                continue
+            return sock, True
+        
+        sock = socket.create_connection((host, port), timeout=5.0)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock, False
+    
+    def _return(self, host, port, sock):
+        """Put a healthy connection back into the pool, closing it if the pool is full or gone"""
+        with self._pool_lock:
+            # close() may have cleared the pools while the socket was in use
+            pool = self._pool.get((host, port))
+            if pool is not None:
+                try:
+                    pool.put_nowait(sock)
+                    return
+                except queue.Full:
+                    pass
+        sock.close()
+    
+    @staticmethod
+    def _recv_line(sock):
+        """Receive until the newline that ends a response, or until the server closes"""
+        data = bytearray()
+        while not data.endswith(b'\n'):
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            data += chunk
+        return data
+    
+    @staticmethod
+    def _recv_error_reply(sock):
+        """Read whatever response arrived before the server dropped the connection"""
+        data = bytearray()
+        try:
+            while not data.endswith(b'\n'):
+                chunk = sock.recv(4096)
+                if not chunk:
+                    break
+                data += chunk
+        except OSError:
+            pass
+        return data
+    
+    def _send_pooled(self, host, port, message, file=None, file_size=0):
+        """
+        Send a newline-terminated JSON message over a pooled connection
+        
+        The server keeps connections open between messages, so sockets are
+        reused across calls. A pooled socket the server has since closed is
+        discarded and the message is retried once on a fresh connection.
+        
+        With a file, the message must announce file_size as its top-level
+        content_length; the file's first file_size bytes follow the message
+        through socket.sendfile, which falls back to a plain send loop where
+        os.sendfile is unavailable. Once the file has started going out the
+        message is never resent; if the server drops the connection, its
+        error response is returned when one arrived.
+        
+        Args:
+            host: Server host
+            port: Server port
+            message: Message dictionary
+            file: Binary file object to send after the message, if any
+            file_size: Number of bytes of file to send
+            
+        Returns:
+            The parsed response, the raw response text if it is not JSON, or None
+        """
+        payload = orjson.dumps(message) + b'\n'
+        
+        while True:
+            sock, reused = self._borrow(host, port)
+            sending_file = False
+            try:
+                sock.sendall(payload)
+                if file is not None:
+                    sending_file = True
+                    sock.sendfile(file, 0, file_size)
+                
+                data = self._recv_line(sock)
+            except socket.timeout:
+                # The request may have been delivered, so it is not resent
+                sock.close()
+                raise
+            except OSError:
+                if sending_file:
+                    # The server rejected the header and closed the connection;
+                    # resending the file would be rejected again
+                    data = self._recv_error_reply(sock)
+                    sock.close()
+                    if not data:
+                        raise
+                    break
+                sock.close()
+                if reused:
+                    continue
+                raise
+            
+            if not data.endswith(b'\n'):
+                # Connection closed by the server
+                sock.close()
+                if reused and not data and not sending_file:
+                    continue
+            else:
+                self._return(host, port, sock)
+            break
+        
+        if not data:
+            return None
+        
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return data.decode('utf-8').strip()
+    
+    def close(self):
+        """Close all pooled connections"""
+        with self._pool_lock:
+            pools = list(self._pool.values())
+            self._pool.clear()
+        
+        for pool in pools:
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
     
     def send_message(self, host, port, protocol_name, data, use_discovery=False):
         """Send a message from the client to a server"""
@@ -149,35 +356,35 @@ class ClientManager:
                     print("No nodes found")
                     return None
                 
-                print(f"Discovered {len(nodes)} nodes:")
+                print(f"Discovered {len(nodes)} nodes")
                 
-                # Look for server nodes
-                servers = []
-                for node_id, info in nodes.items():
-                    print(f"  - {node_id}: {info}")
-                    
-                    if info.get('type') == 'witch-series-server':
-                        servers.append((node_id, info))
+                if logger.isEnabledFor(logging.DEBUG):
+                    for node_id, info in nodes.items():
+                        logger.debug("  - %s: %s", node_id, info)
                 
-                if not servers:
+                # Connect to the first server node
+                first_server = next(
+                    ((node_id, info) for node_id, info in nodes.items()
+                     if info.get('type') == 'witch-series-server'),
+                    None
+                )
+                if first_server is None:
                     print("No witch-series servers found")
                     return None
                 
-                # Connect to the first server
-                server_node_id, server_info = servers[0]
+                server_node_id, server_info = first_server
                 print(f"Connecting to server {server_node_id}...")
                 
                 # Update host information
                 host = server_info.get('local_ip', '127.0.0.1')
                 port = server_info.get('port', 8888)
             
-            # Send message
-            response = self.client.send_protocol_message(
-                host=host,
-                port=port,
-                protocol_name=protocol_name,
-                data=data
-            )
+            # Send message over a pooled connection
+            response = self._send_pooled(host, port, {
+                'protocol_name': protocol_name,
+                'data': data,
+                'timestamp': datetime.now().isoformat()
+            })
             
             # Display response
             if response:
@@ -187,9 +394,8 @@ class ClientManager:
             
             return response
         
-        except Exception as e:
-            print(f"Error sending message: {e}")
-            traceback.print_exc()
+        except Exception:
+            _log_exc("Error sending message")
             return None
     
     def send_file(self, host, port, protocol_name, file_path):
@@ -199,28 +405,28 @@ class ClientManager:
                 print(f"File not found: {file_path}")
                 return None
             
-            # Read file content
             with open(file_path, 'rb') as f:
-                file_content = f.read()
-            
-            # Create data object
-            file_name = os.path.basename(file_path)
-            data = {
-                'file_name': file_name,
-                'content': file_content,
-                'size': len(file_content),
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            print(f"Sending file '{file_name}' ({len(file_content)} bytes) to server {host}:{port}...")
-            
-            # Send message
-            response = self.client.send_protocol_message(
-                host=host,
-                port=port,
-                protocol_name=protocol_name,
-                data=data
-            )
+                # Create data object; the content itself follows as raw bytes
+                file_name = os.path.basename(file_path)
+                file_size = os.fstat(f.fileno()).st_size
+                if file_size > MAX_CONTENT_LENGTH:
+                    print(f"File too large: {file_size} bytes (limit {MAX_CONTENT_LENGTH})")
+                    return None
+                data = {
+                    'file_name': file_name,
+                    'size': file_size,
+                    'timestamp': datetime.now().isoformat()
+                }
+                
+                print(f"Sending file '{file_name}' ({file_size} bytes) to server {host}:{port}...")
+                
+                # Send message over a pooled connection, then the file through sendfile
+                response = self._send_pooled(host, port, {
+                    'protocol_name': protocol_name,
+                    'content_length': file_size,
+                    'data': data,
+                    'timestamp': datetime.now().isoformat()
+                }, file=f, file_size=file_size)
             
             # Display response
             if response:
@@ -230,86 +436,113 @@ class ClientManager:
             
             return response
         
-        except Exception as e:
-            print(f"Error sending file: {e}")
-            traceback.print_exc()
+        except Exception:
+            _log_exc("Error sending file")
             return None
 
 
 class DiscoveryManager:
     """Manages node discovery and broadcasting"""
     
+    # Seconds a discovery result is reused before an unforced scan runs again;
+    # while auto-discovery runs, its interval caps this so the configured
+    # interval is honoured
+    SCAN_TTL = 10.0
+    
     def __init__(self):
         self.discovered_nodes = {}
         self.auto_discovery_thread = None
         self.auto_broadcast_thread = None
         self.stop_discovery_thread = threading.Event()
         self.stop_broadcast_thread = threading.Event()
+        self.discovery_interval = None  # Seconds between auto-discovery cycles, read by the worker each cycle
+        self._last_scan_ts = float('-inf')  # time.monotonic() of the last finished scan
+        self._last_node_count = None  # Node count of the last reported scan
     
-    def discover_nodes(self):
-        """Discover nodes on the network"""
+    def discover_nodes(self, force=False):
+        """
+        Discover nodes on the network
+        
+        Results are reused for SCAN_TTL seconds after a scan finishes (or for
+        the auto-discovery interval, if shorter), so implicit refreshes and the
+        auto-discovery worker don't flood the network back to back. Explicit
+        user rescans should pass force=True.
+        
+        Args:
+            force: Scan even if a recent result is available
+        """
+        ttl = self.SCAN_TTL
+        if self.discovery_interval is not None:
+            ttl = min(ttl, self.discovery_interval)
+        if not force and time.monotonic() - self._last_scan_ts < ttl:
+            logger.debug("Using discovery results from the last %.0fs (%d nodes)", ttl, len(self.discovered_nodes))
+            return self.discovered_nodes
+        
         try:
-            print("Discovering nodes on the network...")
+            logger.info("Discovering nodes on the network...")
             # 待機時間を3秒から10秒に延長して、より多くのノードを発見する
             nodes = discover_nodes(wait_time=10)
             
             # Store discovered nodes
             self.discovered_nodes = nodes or {}
+            self._last_scan_ts = time.monotonic()
+            
+            # Only report when the node count changes, so periodic scans
+            # don't repeat the same message
+            node_count = len(self.discovered_nodes)
+            if node_count == self._last_node_count:
+                logger.debug("Discovered %d nodes (unchanged)", node_count)
+                return self.discovered_nodes
+            self._last_node_count = node_count
             
             if not nodes:
-                print("No nodes found. Please check network configuration and firewall settings.")
-                print("- Make sure UDP port 8889 is not blocked by the firewall")
-                print("- Ensure both machines are on the same network/subnet")
-                print("- Try disabling firewall temporarily to test")
+                logger.warning(
+                    "No nodes found. Please check network configuration and firewall settings.\n"
+                    "- Make sure UDP port 8889 is not blocked by the firewall\n"
+                    "- Ensure both machines are on the same network/subnet\n"
+                    "- Try disabling firewall temporarily to test"
+                )
             else:
-                print(f"Discovered {len(nodes)} nodes:")
+                logger.info("Discovered %d nodes", len(nodes))
                 
-                for node_id, info in nodes.items():
-                    print(f"  - {node_id}: {info}")
-                    if 'local_ip' in info:
-                        print(f"    IP: {info['local_ip']}")
-                    if 'port' in info:
-                        print(f"    Port: {info['port']}")
-                    if 'server_name' in info:
-                        print(f"    Name: {info['server_name']}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    for node_id, info in nodes.items():
+                        logger.debug("  - %s: %s", node_id, info)
             
             return self.discovered_nodes
-        except Exception as e:
-            print(f"Error discovering nodes: {e}")
-            traceback.print_exc()
-            print("Try checking your network configuration:")
-            print("- UDP broadcasts may be blocked by routers/firewalls")
-            print("- Make sure port 8889 is open for UDP traffic")
-            print("- Check your system's network permissions")
+        except Exception:
+            _log_exc("Error discovering nodes", (
+                "Try checking your network configuration:",
+                "- UDP broadcasts may be blocked by routers/firewalls",
+                "- Make sure port 8889 is open for UDP traffic",
+                "- Check your system's network permissions"
+            ))
             return {}
     
     def broadcast_presence(self, server_id, port, server_name="anonymous"):
         """Broadcast presence on the network"""
         try:
             # Service information for node discovery
-            service_info = {
-                'type': 'witch-series-server',
-                'port': port,
-                'protocols': ['example_protocol', 'text_data', 'json_data', 'image_data', 'file_data'],
-                'server_name': server_name
-            }
+            service_info = _make_service_info(port, server_name)
             
-            print(f"Broadcasting presence with node ID: {server_id} (Server Name: {server_name})")
+            logger.debug("Broadcasting presence with node ID: %s (Server Name: %s)", server_id, server_name)
             success = broadcast_presence(node_id=server_id, service_info=service_info)
             if success:
-                print("Broadcast sent successfully")
+                logger.debug("Broadcast sent successfully")
             else:
-                print("Broadcast may not have been sent - check network configuration")
-                print("- UDP broadcast traffic may be blocked by your network")
-                print("- Check firewall settings to allow UDP port 8889")
+                logger.warning(
+                    "Broadcast may not have been sent - check network configuration\n"
+                    "- UDP broadcast traffic may be blocked by your network\n"
+                    "- Check firewall settings to allow UDP port 8889"
+                )
             return success
-        except Exception as e:
-            print(f"Error broadcasting presence: {e}")
-            traceback.print_exc()
-            print("Network troubleshooting tips:")
-            print("- Check Windows Defender Firewall settings")
-            print("- Ensure UDP broadcast traffic is allowed")
-            print("- Try running the application as administrator")
+        except Exception:
+            _log_exc("Error broadcasting presence", (
+                "Network troubleshooting tips:",
+                "- Check Windows Defender Firewall settings",
+                "- Ensure UDP broadcast traffic is allowed",
+                "- Try running the application as administrator"
+            ))
             return False
     
     def start_auto_discovery(self, interval, callback=None):
@@ -319,9 +552,10 @@ class DiscoveryManager:
             return False  # Thread already running
         
         self.stop_discovery_thread.clear()
+        self.discovery_interval = interval
         self.auto_discovery_thread = threading.Thread(
             target=self.auto_discovery_worker,
-            args=(interval, callback)
+            args=(callback,)
         )
         self.auto_discovery_thread.daemon = True
         self.auto_discovery_thread.start()
@@ -340,6 +574,7 @@ class DiscoveryManager:
         
         self.stop_discovery_thread.set()
         self.auto_discovery_thread.join(1.0)  # Wait for thread to finish
+        self.discovery_interval = None
         
         # Also stop broadcasting
         self.stop_auto_broadcast()
@@ -347,22 +582,34 @@ class DiscoveryManager:
         print("Auto-discovery stopped")
         return True
     
-    def auto_discovery_worker(self, interval, callback=None):
+    def set_discovery_interval(self, interval):
+        """
+        Change the interval of the running auto-discovery thread
+        
+        The new interval is used from the next discovery cycle on.
+        
+        Args:
+            interval: Seconds between discovery cycles
+            
+        Returns:
+            bool: True if an auto-discovery thread is running
+        """
+        self.discovery_interval = interval
+        return self.auto_discovery_thread is not None and self.auto_discovery_thread.is_alive()
+    
+    def auto_discovery_worker(self, callback=None):
         """Worker function for auto-discovery thread"""
         while not self.stop_discovery_thread.is_set():
             try:
                 nodes = self.discover_nodes()
                 if callback:
                     callback(nodes)
-            except Exception as e:
-                print(f"Error in auto-discovery worker: {e}")
-                traceback.print_exc()
+            except Exception:
+                _log_exc("Error in auto-discovery worker")
             
-            # Wait for the next discovery cycle
-            remaining = interval
-            while remaining > 0 and not self.stop_discovery_thread.is_set():
-                time.sleep(1)
-                remaining -= 1
+            # Wait for the next discovery cycle, waking immediately on stop
+            if self.stop_discovery_thread.wait(timeout=self.discovery_interval):
+                break
     
     def start_auto_broadcast(self, server_id, port, server_name="anonymous"):
         """Start automatic broadcasting thread"""
@@ -396,22 +643,47 @@ class DiscoveryManager:
         while not self.stop_broadcast_thread.is_set():
             try:
                 self.broadcast_presence(server_id, port, server_name)
-            except Exception as e:
-                print(f"Error in auto-broadcast worker: {e}")
-                traceback.print_exc()
+            except Exception:
+                _log_exc("Error in auto-broadcast worker")
             
-            # Wait for the next broadcast cycle (every 5 seconds)
-            remaining = 5
-            while remaining > 0 and not self.stop_broadcast_thread.is_set():
-                time.sleep(1)
-                remaining -= 1
+            # Wait for the next broadcast cycle (every 5 seconds), waking immediately on stop
+            if self.stop_broadcast_thread.wait(timeout=5.0):
+                break
 
 
 class ProtocolManager:
     """Manages protocol operations"""
     
     def __init__(self):
-        pass
+        # Loaded protocols by name, with the file modification time they were read at
+        self._protocol_cache = {}
+    
+    def _load_protocol_cached(self, name):
+        """
+        Load a protocol definition, reusing the last load while its file is unchanged
+        
+        A protocol whose modification time can't be read is loaded uncached,
+        and a missing protocol is never cached.
+        
+        Args:
+            name: Protocol name
+            
+        Returns:
+            dict or None: Protocol definition, None if not found
+        """
+        try:
+            mtime = os.path.getmtime(protocol_manager.get_protocol_path(name))
+        except OSError:
+            return protocol_manager.load_protocol(name)
+        
+        cached = self._protocol_cache.get(name)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        
+        protocol = protocol_manager.load_protocol(name)
+        if protocol is not None:
+            self._protocol_cache[name] = (mtime, protocol)
+        return protocol
     
     def list_protocols(self):
         """List available protocols"""
@@ -425,7 +697,7 @@ class ProtocolManager:
         
         protocol_info = []
         for name in protocols:
-            protocol = protocol_manager.load_protocol(name)
+            protocol = self._load_protocol_cached(name)
             if protocol:
                 print(f"\n[Protocol name: {name}]")
                 print(f"  Number: {protocol.get('number', 'unknown')}")
@@ -465,9 +737,8 @@ class ProtocolManager:
             protocol_path = protocol_manager.save_protocol(protocol)
             print(f"Protocol saved to: {protocol_path}")
             return True
-        except Exception as e:
-            print(f"Error creating protocol: {e}")
-            traceback.print_exc()
+        except Exception:
+            _log_exc("Error creating protocol")
             return False
 
 
@@ -12,20 +12,23 @@ import sys
 import tkinter as tk
 from tkinter import messagebox
 import socket
+import functools
 
-# Add the project root directory to the path
+# Add the project root directory to the path when run as a script
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-sys.path.insert(0, project_root)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
 # Import the GUI application class
 from tools.gui_tester_app import WitchCoreGUI
 
 
+@functools.lru_cache(maxsize=1)
 def get_hostname():
-    """Get the hostname of the machine"""
+    """Get the hostname of the machine (looked up once per process)"""
     try:
         return socket.gethostname()
-    except:
+    except (OSError, UnicodeError):
         return "unknown-host"
 
 
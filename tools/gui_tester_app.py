@@ -7,55 +7,106 @@ GUI Tester App for witch-core
 This module contains the GUI components and application logic for the Witch-Core GUI Tester.
 """
 
-import sys
 import os
+import sys
 import json
 import time
+import queue
+import itertools
+import logging
 import threading
+import concurrent.futures
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
 from datetime import datetime
 
-# Add the project root directory to the path
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-sys.path.insert(0, project_root)
-
 # Import GUI functions
 from tools.gui_functions import (
     ServerManager, ClientManager, DiscoveryManager, ProtocolManager,
     get_server_registry_info
 )
 
+# Default message data presets
+_DEFAULT_TEXT = "Enter plain text message here"
+_DEFAULT_FILE_HELP = "Select a file using the Browse button above.\n\nAdditional JSON metadata can be added here:"
+# Console output limits: lines kept in the widget, and queued writes
+# inserted per drain
+_CONSOLE_MAX_LINES = 10000
+_CONSOLE_DRAIN_BATCH = 200
 
-class RedirectText:
-    """Redirect print statements to a tkinter widget"""
-    def __init__(self, text_widget):
-        self.text_widget = text_widget
-        self.buffer = ""
-        
+# Message data longer than this (characters) is parsed as JSON on the send
+# worker instead of the Tk thread
+_JSON_INLINE_PARSE_LIMIT = 64 * 1024
+
+# Seconds since a node's last broadcast before it is shown as stale
+_NODE_STALE_AFTER = 60
+
+_JSON_TEMPLATE = (
+    '{\n'
+    '  "temperature": 22.5,\n'
+    '  "humidity": 45.3,\n'
+    '  "timestamp": "%s",\n'
+    '  "device_id": "sensor-001"\n'
+    '}'
+)
+
+
+class LogQueueHandler(logging.Handler):
+    """Logging handler that queues formatted records for the console"""
+    def __init__(self, q):
+        super().__init__()
+        self.q = q
+    
+    def emit(self, record):
+        try:
+            self.q.put_nowait(self.format(record) + "\n")
+        except Exception:
+            self.handleError(record)
+
+
+class StdoutQueue:
+    """Redirect print statements to a queue drained by the console"""
+    def __init__(self, q):
+        self.q = q
+    
     def write(self, string):
-        self.buffer += string
-        self.text_widget.config(state=tk.NORMAL)
-        self.text_widget.insert(tk.END, string)
-        self.text_widget.see(tk.END)
-        self.text_widget.config(state=tk.DISABLED)
+        self.q.put_nowait(string)
     
     def flush(self):
         pass
 
 
 class WitchCoreGUI:
+    # File types offered by the Browse dialog
+    _FILETYPES = (
+        ("Image Files", "*.png;*.jpg;*.jpeg;*.gif;*.bmp"),
+        ("Text Files", "*.txt"),
+        ("All Files", "*.*")
+    )
+    
+    # Sequence number that keeps generated server IDs unique in this process
+    _id_counter = itertools.count()
+    
     def __init__(self, root, server_name="anonymous"):
         self.root = root
         self.root.title("Witch-Core GUI Tester")
         self.root.geometry("1000x800")  # Increased size for better layout
         self.root.minsize(900, 700)     # Increased minimum size
         
-        # Initialize managers
-        self.server_manager = ServerManager()
-        self.client_manager = ClientManager()
-        self.discovery_manager = DiscoveryManager()
-        self.protocol_manager = ProtocolManager()
+        # Managers are created on a background thread once the window is built
+        self.server_manager = None
+        self.client_manager = None
+        self.discovery_manager = None
+        self.protocol_manager = None
+        self.manager_controls = []  # Widgets that need the managers
+        
+        # Worker threads for sends, so the Tk thread never waits on the network
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        
+        # Widgets of lazily built tabs, None until their tab is first shown
+        self.node_select_combobox = None
+        self.discovery_status = None
+        self.nodes_tree = None
         
         # Variables
         self.server_running = False
@@ -71,12 +122,36 @@ class WitchCoreGUI:
         
         # Node selection variables
         self.discovered_nodes = {}
+        self._node_rows = []
         self.selected_node = tk.StringVar(value="")
         self.node_display_to_id = {}
+        self._last_node_strings = ()
+        self._last_dropdown_len = -1
+        self._background_discovery = False  # A dropdown-triggered scan is running
+        
+        # Treeview rows by node ID, for in-place updates
+        self._tree_iids = {}
+        self._tree_values = {}
+        self._tree_tags = {}
+        self._tree_update_scheduled = False
+        
+        # Latest node snapshot from the discovery thread, drained on the Tk thread
+        self._nodes_q = queue.Queue(maxsize=1)
         
         # Message data variables
         self.message_data_type = tk.StringVar(value="json_data")
+        self._data_type_cached = "json_data"
+        self.message_data_type.trace_add(
+            "write", lambda *_: setattr(self, "_data_type_cached", self.message_data_type.get())
+        )
         self.message_file_path = tk.StringVar(value="")
+        self._last_browse_dir = os.path.expanduser("~")
+        self._fillers = {
+            "text_data": self._fill_text,
+            "json_data": self._fill_json,
+            "image_data": self._fill_file,
+            "file_data": self._fill_file,
+        }
         
         # Auto-discovery variables (auto-discovery enabled by default)
         self.auto_discovery_enabled = tk.BooleanVar(value=True)
@@ -105,17 +180,67 @@ class WitchCoreGUI:
         self.console_frame = ttk.Frame(root)
         self.console_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        # Set up the tabs and console
+        # Set up the visible tab and the console; the other tabs are built
+        # the first time they are selected
+        self._tab_builders = {
+            str(self.server_frame): self.setup_server_tab,
+            str(self.client_frame): self.setup_client_tab,
+            str(self.protocol_frame): self.setup_protocol_tab,
+            str(self.discovery_frame): self.setup_discovery_tab,
+            str(self.settings_frame): self.setup_settings_tab,
+        }
+        self._built_tabs = {str(self.server_frame)}
         self.setup_server_tab()
-        self.setup_client_tab()
-        self.setup_protocol_tab()
-        self.setup_discovery_tab()
-        self.setup_settings_tab()
         self.setup_console()
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
         
-        # Redirect standard output to the console
+        # Route print output and log records through a queue that the Tk
+        # thread drains into the console
+        self._log_q = queue.SimpleQueue()
+        self._log_handler = LogQueueHandler(self._log_q)
+        logging.getLogger().addHandler(self._log_handler)
         self.old_stdout = sys.stdout
-        sys.stdout = RedirectText(self.console)
+        sys.stdout = StdoutQueue(self._log_q)
+        self.root.after(50, self._drain_log)
+        
+        threading.Thread(target=self._bg_init, daemon=True).start()
+        self.root.after(50, self._drain_nodes_queue)
+    
+    def _on_tab_changed(self, event):
+        """Build the selected tab on its first selection"""
+        tab = self.notebook.select()
+        if tab in self._built_tabs:
+            return
+        self._built_tabs.add(tab)
+        self._tab_builders[tab]()
+    
+    def _add_manager_control(self, widget):
+        """Track a control that uses the managers, disabled until they exist"""
+        self.manager_controls.append(widget)
+        if self.protocol_manager is None:
+            widget.config(state=tk.DISABLED)
+    
+    def _bg_init(self):
+        """Create the managers off the Tk thread"""
+        try:
+            managers = (ServerManager(), ClientManager(), DiscoveryManager(), ProtocolManager())
+        except Exception as e:
+            self.root.after(0, self._init_failed, e)
+            return
+        self.root.after(0, self._post_init, managers)
+    
+    def _init_failed(self, error):
+        """Report a manager that could not be created; its controls stay disabled"""
+        print(f"Error initializing managers: {error}")
+        messagebox.showerror("Error", f"Failed to initialize: {error}")
+    
+    def _post_init(self, managers):
+        """Install the managers and enable the controls that use them"""
+        (self.server_manager, self.client_manager,
+         self.discovery_manager, self.protocol_manager) = managers
+        
+        for widget in self.manager_controls:
+            widget.config(state=tk.NORMAL)
         
         # Start auto-discovery by default
         if self.auto_discovery_enabled.get():
@@ -159,6 +284,7 @@ class WitchCoreGUI:
         
         self.start_button = ttk.Button(control_frame, text="Start Server", command=self.start_server)
         self.start_button.pack(side=tk.LEFT, padx=5, pady=5)
+        self._add_manager_control(self.start_button)
         
         self.stop_button = ttk.Button(control_frame, text="Stop Server", command=self.stop_server, state=tk.DISABLED)
         self.stop_button.pack(side=tk.LEFT, padx=5, pady=5)
@@ -171,6 +297,7 @@ class WitchCoreGUI:
             command=self.toggle_auto_broadcast
         )
         auto_broadcast_check.pack(side=tk.LEFT, padx=5, pady=5)
+        self._add_manager_control(auto_broadcast_check)
         
         # Server status
         self.server_status = ttk.Label(frame, text="Server Status: Not Running", font=("", 10, "bold"))
@@ -185,7 +312,7 @@ class WitchCoreGUI:
         name = self.server_name.get()
         if not name:
             name = "anonymous"
-        self.server_id.set(f"{name}-{int(time.time())}")
+        self.server_id.set(f"{name}-{time.monotonic_ns() & 0xFFFFFFFF:08x}-{next(self._id_counter)}")
         self.server_description.set(f"Witch-Core Test Server ({name})")
         
     def setup_client_tab(self):
@@ -202,6 +329,7 @@ class WitchCoreGUI:
         self.node_select_combobox = ttk.Combobox(config_frame, textvariable=self.selected_node, width=50)
         self.node_select_combobox.grid(row=0, column=1, columnspan=3, padx=5, pady=5, sticky=tk.W+tk.E)
         self.node_select_combobox.bind("<<ComboboxSelected>>", self.on_node_selected)
+        self._update_node_dropdown()
         
         # Host input
         ttk.Label(config_frame, text="Host:").grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
@@ -246,47 +374,44 @@ class WitchCoreGUI:
         
         send_button = ttk.Button(control_frame, text="Send Message", command=self.send_message)
         send_button.pack(side=tk.LEFT, padx=5, pady=5)
+        self._add_manager_control(send_button)
         
         discover_button = ttk.Button(control_frame, text="Discover Nodes", command=self.discover_nodes)
         discover_button.pack(side=tk.LEFT, padx=5, pady=5)
+        self._add_manager_control(discover_button)
         
         refresh_dropdown_button = ttk.Button(control_frame, text="Refresh Node List", command=self.refresh_node_dropdown)
         refresh_dropdown_button.pack(side=tk.LEFT, padx=5, pady=5)
+        self._add_manager_control(refresh_dropdown_button)
     
     def browse_file(self):
         """Open file browser to select a file"""
         file_path = filedialog.askopenfilename(
             title="Select File",
-            filetypes=[
-                ("Image Files", "*.png;*.jpg;*.jpeg;*.gif;*.bmp"),
-                ("Text Files", "*.txt"),
-                ("All Files", "*.*")
-            ]
+            filetypes=self._FILETYPES,
+            initialdir=self._last_browse_dir
         )
         if file_path:
+            self._last_browse_dir = os.path.dirname(file_path)
             self.message_file_path.set(file_path)
             print(f"Selected file: {file_path}")
     
     def set_default_message_data(self):
         """Set default message data based on selected data type"""
-        data_type = self.message_data_type.get()
-        
         self.message_data.delete(1.0, tk.END)
-        
-        if data_type == "text_data":
-            self.message_data.insert(tk.END, "Enter plain text message here")
-        
-        elif data_type == "json_data":
-            default_json = {
-                "temperature": 22.5,
-                "humidity": 45.3,
-                "timestamp": datetime.now().isoformat(),
-                "device_id": "sensor-001"
-            }
-            self.message_data.insert(tk.END, json.dumps(default_json, indent=2))
-        
-        elif data_type in ["image_data", "file_data"]:
-            self.message_data.insert(tk.END, "Select a file using the Browse button above.\n\nAdditional JSON metadata can be added here:")
+        self._fillers.get(self._data_type_cached, self._fill_text)()
+    
+    def _fill_text(self):
+        """Insert the plain text preset"""
+        self.message_data.insert(tk.END, _DEFAULT_TEXT)
+    
+    def _fill_json(self):
+        """Insert the JSON preset with the current timestamp"""
+        self.message_data.insert(tk.END, _JSON_TEMPLATE % datetime.now().isoformat())
+    
+    def _fill_file(self):
+        """Insert the file selection help text"""
+        self.message_data.insert(tk.END, _DEFAULT_FILE_HELP)
     
     def on_data_type_selected(self, event):
         """Handle data type selection"""
@@ -299,11 +424,7 @@ class WitchCoreGUI:
             return
         
         # Find the node ID based on selected display string
-        node_id = None
-        for display_str, id in self.node_display_to_id.items():
-            if display_str == selected:
-                node_id = id
-                break
+        node_id = self.node_display_to_id.get(selected)
         
         if not node_id or node_id not in self.discovered_nodes:
             print("Invalid node selection")
@@ -329,37 +450,51 @@ class WitchCoreGUI:
     
     def refresh_node_dropdown(self):
         """Refresh the node selection dropdown with current discovered nodes"""
-        # Clear dropdown
-        self.node_select_combobox['values'] = []
-        
-        # If there are no discovered nodes, try to discover them
+        # If there are no discovered nodes, discover them in the background;
+        # the result refills the dropdown through on_nodes_discovered
         if not self.discovery_manager.discovered_nodes:
-            self.discover_nodes()
+            if not self._background_discovery:
+                self._background_discovery = True
+                threading.Thread(target=self._discover_in_background, daemon=True).start()
+            return
         
         # Update discovered nodes from discovery manager
-        self.discovered_nodes = self.discovery_manager.discovered_nodes
+        if self.discovery_manager.discovered_nodes is not self.discovered_nodes:
+            self._set_discovered_nodes(self.discovery_manager.discovered_nodes)
+        
+        self._update_node_dropdown()
+    
+    def _discover_in_background(self):
+        """Run one discovery scan off the Tk thread and queue its result"""
+        try:
+            self.on_nodes_discovered(self.discovery_manager.discover_nodes(force=True))
+        finally:
+            self._background_discovery = False
+    
+    def _update_node_dropdown(self):
+        """Show the current discovered nodes in the dropdown, if the Client tab is built"""
+        if self.node_select_combobox is None:
+            return
         
         # Format node display strings
-        node_strings = []
-        self.node_display_to_id = {}
+        node_ids = tuple(row[0] for row in self._node_rows)
+        node_strings = tuple(
+            f"{server_name}: {node_id} ({ip}:{port}) - {node_type}"
+            for node_id, server_name, ip, port, node_type, _ in self._node_rows
+        )
         
-        for node_id, info in self.discovered_nodes.items():
-            ip = info.get('local_ip', info.get('host', 'unknown'))
-            port = info.get('port', '?')
-            node_type = info.get('type', 'unknown')
-            server_name = info.get('server_name', 'anonymous')
-            
-            # Create display string
-            display_str = f"{server_name}: {node_id} ({ip}:{port}) - {node_type}"
-            node_strings.append(display_str)
-            
-            # Map display string to node ID
-            self.node_display_to_id[display_str] = node_id
+        # Nothing to redraw if the list is unchanged
+        if node_strings == self._last_node_strings:
+            return
         
-        # Update dropdown
+        # Map display strings to node IDs and update dropdown
+        self._last_node_strings = node_strings
+        self.node_display_to_id = dict(zip(node_strings, node_ids))
         self.node_select_combobox['values'] = node_strings
         
-        print(f"Node dropdown refreshed with {len(node_strings)} nodes")
+        if len(node_strings) != self._last_dropdown_len:
+            self._last_dropdown_len = len(node_strings)
+            print(f"Node dropdown refreshed with {len(node_strings)} nodes")
 
     def setup_protocol_tab(self):
         """Set up the protocol tab components"""
@@ -372,6 +507,7 @@ class WitchCoreGUI:
         # Protocol list button
         list_protocols_button = ttk.Button(protocol_list_frame, text="List Available Protocols", command=self.list_protocols)
         list_protocols_button.pack(fill=tk.X, expand=False, padx=5, pady=5)
+        self._add_manager_control(list_protocols_button)
         
         # Create protocol frame
         create_protocol_frame = ttk.LabelFrame(frame, text="Create New Protocol")
@@ -395,6 +531,7 @@ class WitchCoreGUI:
         # Create button
         create_button = ttk.Button(create_protocol_frame, text="Create Protocol", command=self.create_protocol)
         create_button.grid(row=3, column=0, columnspan=2, padx=5, pady=10)
+        self._add_manager_control(create_button)
         
     def setup_discovery_tab(self):
         """Set up the discovery tab components"""
@@ -406,6 +543,7 @@ class WitchCoreGUI:
         
         discover_button = ttk.Button(control_frame, text="Discover Nodes", command=self.discover_nodes)
         discover_button.pack(side=tk.LEFT, padx=5, pady=5)
+        self._add_manager_control(discover_button)
         
         # Auto discovery checkbox (checked by default)
         auto_discovery_check = ttk.Checkbutton(
@@ -415,9 +553,11 @@ class WitchCoreGUI:
             command=self.toggle_auto_discovery
         )
         auto_discovery_check.pack(side=tk.LEFT, padx=5, pady=5)
+        self._add_manager_control(auto_discovery_check)
         
         broadcast_button = ttk.Button(control_frame, text="Broadcast Presence", command=self.broadcast_presence)
         broadcast_button.pack(side=tk.LEFT, padx=5, pady=5)
+        self._add_manager_control(broadcast_button)
         
         # Auto discovery status
         interval = self.auto_discovery_interval.get()
@@ -451,6 +591,13 @@ class WitchCoreGUI:
         scrollbar = ttk.Scrollbar(nodes_frame, orient=tk.VERTICAL, command=self.nodes_tree.yview)
         self.nodes_tree.configure(yscroll=scrollbar.set)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # Row styles for node freshness
+        self.nodes_tree.tag_configure("stale", foreground="#888")
+        self.nodes_tree.tag_configure("fresh", foreground="#000")
+        
+        # Show the nodes discovered before the tab was built
+        self._render_nodes_treeview()
     
     def setup_settings_tab(self):
         """Set up the settings tab components"""
@@ -492,6 +639,7 @@ class WitchCoreGUI:
         
         apply_button = ttk.Button(apply_frame, text="Apply Settings", command=self.apply_settings)
         apply_button.pack(side=tk.RIGHT, padx=5, pady=5)
+        self._add_manager_control(apply_button)
         
         # Help text
         help_frame = ttk.LabelFrame(frame, text="Help")
@@ -514,20 +662,24 @@ Tips:
     
     def apply_settings(self):
         """Apply settings changes"""
-        # If auto-discovery is running, restart it with new interval
+        interval = self.auto_discovery_interval.get()
+        b_interval = self.auto_broadcast_interval.get()
+        
+        # If auto-discovery is running, switch it to the new interval in place
         if self.auto_discovery_enabled.get():
-            self.discovery_manager.stop_auto_discovery()
-            self.discovery_manager.start_auto_discovery(
-                interval=self.auto_discovery_interval.get(),
-                callback=self.on_nodes_discovered
-            )
-            self.discovery_status.config(text=f"Auto: ON ({self.auto_discovery_interval.get()}s)")
+            if not self.discovery_manager.set_discovery_interval(interval):
+                self.discovery_manager.start_auto_discovery(
+                    interval=interval,
+                    callback=self.on_nodes_discovered
+                )
+            if self.discovery_status is not None:
+                self.discovery_status.config(text=f"Auto: ON ({interval}s)")
         
         # If auto-broadcast is running, restart it with new interval
         if self.auto_broadcast_enabled.get() and self.server_manager.server_running:
             self.discovery_manager.stop_auto_broadcast()
             self.discovery_manager.start_auto_broadcast(
-                interval=self.auto_broadcast_interval.get(),
+                interval=b_interval,
                 server_id=self.server_id.get(),
                 port=self.server_port.get(),
                 server_name=self.server_name.get()
@@ -550,75 +702,187 @@ Tips:
             font=("Courier New", 10)  # Monospace font good for distinguishing l and 1
         )
         self.console.pack(fill=tk.BOTH, expand=True)
-        self.console.config(state=tk.DISABLED)
+        
+        # Keep the widget writable for output but ignore typing, except
+        # for copy and select-all
+        self.console.bind("<Key>", self._console_key)
         
         # Clear console button
         clear_button = ttk.Button(self.console_frame, text="Clear Console", command=self.clear_console)
         clear_button.pack(anchor=tk.E, padx=5, pady=5)
     
+    def _drain_log(self):
+        """Insert queued console output into the widget in one operation"""
+        chunks = []
+        try:
+            for _ in range(_CONSOLE_DRAIN_BATCH):
+                chunks.append(self._log_q.get_nowait())
+        except queue.Empty:
+            pass
+        
+        if chunks:
+            self.console.insert(tk.END, "".join(chunks))
+            
+            # Drop the oldest lines in one delete once the cap is exceeded
+            line_count = int(self.console.index('end-1c').split('.')[0])
+            excess = line_count - _CONSOLE_MAX_LINES
+            if excess > 0:
+                self.console.delete('1.0', f'{excess + 1}.0')
+            
+            self.console.see(tk.END)
+        
+        self.root.after(50, self._drain_log)
+    
+    @staticmethod
+    def _console_key(event):
+        """Block edits in the console while allowing Ctrl+C and Ctrl+A"""
+        if event.state & 0x4 and event.keysym.lower() in ("c", "a"):
+            return None
+        return "break"
+    
     def clear_console(self):
         """Clear the console output"""
-        self.console.config(state=tk.NORMAL)
         self.console.delete(1.0, tk.END)
-        self.console.config(state=tk.DISABLED)
         print("Console cleared")
     
     def toggle_auto_discovery(self):
         """Toggle automatic node discovery"""
         if self.auto_discovery_enabled.get():
+            interval = self.auto_discovery_interval.get()
             success = self.discovery_manager.start_auto_discovery(
-                interval=self.auto_discovery_interval.get(),
+                interval=interval,
                 callback=self.on_nodes_discovered
             )
-            if success:
-                self.discovery_status.config(text=f"Auto: ON ({self.auto_discovery_interval.get()}s)")
+            if success and self.discovery_status is not None:
+                self.discovery_status.config(text=f"Auto: ON ({interval}s)")
         else:
             success = self.discovery_manager.stop_auto_discovery()
-            if success:
+            if success and self.discovery_status is not None:
                 self.discovery_status.config(text="Auto: OFF")
     
     def on_nodes_discovered(self, nodes):
-        """Callback when nodes are discovered"""
-        # Update the discovered nodes
-        self.discovered_nodes = nodes
-        
-        # Update the nodes treeview
-        self.update_nodes_treeview(nodes)
+        """Callback when nodes are discovered (runs on the discovery thread)"""
+        # Keep only the freshest snapshot; the Tk thread picks it up
+        try:
+            self._nodes_q.put_nowait(nodes)
+        except queue.Full:
+            try:
+                self._nodes_q.get_nowait()
+            except queue.Empty:
+                pass
+            self._nodes_q.put_nowait(nodes)
+    
+    def _drain_nodes_queue(self):
+        """Apply the latest discovered nodes to the UI, at most every 50 ms"""
+        try:
+            nodes = self._nodes_q.get_nowait()
+        except queue.Empty:
+            pass
+        else:
+            # Update the discovered nodes
+            self._set_discovered_nodes(nodes)
+            
+            # Update the nodes treeview
+            self.update_nodes_treeview()
+            
+            # Update the node dropdown
+            self._update_node_dropdown()
         
-        # Update the node dropdown
-        self.refresh_node_dropdown()
+        self.root.after(50, self._drain_nodes_queue)
+    
+    def _set_discovered_nodes(self, nodes):
+        """Store discovered nodes and flatten them once for the treeview and dropdown"""
+        self.discovered_nodes = nodes if nodes is not None else {}
+        self._node_rows = [
+            (
+                node_id,
+                info.get('server_name', 'anonymous'),
+                info.get('local_ip', info.get('host', 'unknown')),
+                info.get('port', 'N/A'),
+                info.get('type', 'unknown'),
+                ', '.join(info.get('protocols', [])),
+            )
+            for node_id, info in self.discovered_nodes.items()
+        ]
     
-    def update_nodes_treeview(self, nodes):
+    def update_nodes_treeview(self):
         """Update the nodes treeview with discovered nodes"""
-        # Clear the treeview
-        for item in self.nodes_tree.get_children():
-            self.nodes_tree.delete(item)
-        
-        if not nodes:
+        # Collapse back-to-back updates into one render of the latest nodes
+        if not self._tree_update_scheduled:
+            self._tree_update_scheduled = True
+            self.root.after(50, self._render_nodes_treeview)
+    
+    def _render_nodes_treeview(self):
+        """Apply only the added, removed and changed rows to the treeview"""
+        self._tree_update_scheduled = False
+        if self.nodes_tree is None:
             return
         
-        # Add nodes to the treeview with IP address
-        for node_id, info in nodes.items():
-            node_type = info.get('type', 'unknown')
-            port = info.get('port', 'N/A')
-            ip_address = info.get('local_ip', info.get('host', 'unknown'))
-            protocols = ', '.join(info.get('protocols', []))
-            server_name = info.get('server_name', 'anonymous')
-            
-            # Display server name in the node ID column if available
-            display_id = f"{server_name}: {node_id}" if server_name != 'anonymous' else node_id
+        # Treeview values per node, with IP address; the server name is
+        # shown in the node ID column if available
+        rows = {
+            node_id: (
+                f"{server_name}: {node_id}" if server_name != 'anonymous' else node_id,
+                ip_address, port, node_type, protocols
+            )
+            for node_id, server_name, ip_address, port, node_type, protocols in self._node_rows
+        }
+        
+        # Style tag per node from the time of its last broadcast
+        now = time.time()
+        tags = {}
+        for node_id in rows:
+            last_seen = self.discovered_nodes[node_id].get('last_seen')
+            stale = last_seen is not None and now - last_seen > _NODE_STALE_AFTER
+            tags[node_id] = "stale" if stale else "fresh"
+        
+        old = set(self._tree_iids)
+        new = set(rows)
+        
+        removed = old - new
+        if removed:
+            self.nodes_tree.delete(*(self._tree_iids.pop(node_id) for node_id in removed))
+            for node_id in removed:
+                del self._tree_values[node_id]
+                del self._tree_tags[node_id]
+        
+        added = new - old
+        if added:
+            # Hide the data columns during the inserts so the rows are laid
+            # out once when the columns come back
+            self.nodes_tree.configure(displaycolumns=())
+            try:
+                for node_id in added:
+                    values = rows[node_id]
+                    self._tree_iids[node_id] = self.nodes_tree.insert(
+                        '', tk.END, values=values, tags=(tags[node_id],)
+                    )
+                    self._tree_values[node_id] = values
+                    self._tree_tags[node_id] = tags[node_id]
+            finally:
+                self.nodes_tree.configure(displaycolumns="#all")
+        
+        for node_id in new & old:
+            values = rows[node_id]
+            if values != self._tree_values[node_id]:
+                self.nodes_tree.item(self._tree_iids[node_id], values=values)
+                self._tree_values[node_id] = values
             
-            self.nodes_tree.insert('', tk.END, values=(display_id, ip_address, port, node_type, protocols))
+            # Restyle without touching the values
+            if tags[node_id] != self._tree_tags[node_id]:
+                self.nodes_tree.item(self._tree_iids[node_id], tags=(tags[node_id],))
+                self._tree_tags[node_id] = tags[node_id]
     
     def toggle_auto_broadcast(self):
         """Toggle automatic presence broadcast"""
+        enabled = self.auto_broadcast_enabled.get()
         if not self.server_manager.server_running:
-            if self.auto_broadcast_enabled.get():
+            if enabled:
                 self.auto_broadcast_enabled.set(False)
                 messagebox.showinfo("Info", "Start the server first before enabling auto-broadcast")
                 return
         
-        if self.auto_broadcast_enabled.get():
+        if enabled:
             self.discovery_manager.start_auto_broadcast(
                 interval=self.auto_broadcast_interval.get(),
                 server_id=self.server_id.get(),
@@ -684,54 +948,87 @@ Tips:
         """Send a message from the client to the server"""
         host = self.client_host.get()
         port = self.client_port.get()
-        data_type = self.message_data_type.get()
+        data_type = self._data_type_cached
         file_path = self.message_file_path.get()
         
-        try:
-            # Handle different data types
-            if data_type in ["image_data", "file_data"] and file_path:
-                # Send file data
-                response = self.client_manager.send_file(
+        # Handle different data types
+        if data_type in ["image_data", "file_data"] and file_path:
+            # Send file data
+            def send():
+                return self.client_manager.send_file(
                     host=host,
                     port=port,
                     protocol_name=data_type,
                     file_path=file_path
                 )
+        else:
+            # Get message data
+            raw = self.message_data.get(1.0, tk.END)
+            parse_on_worker = False
+            if data_type == "text_data":
+                # For text data, use the raw text
+                data = raw
+            elif len(raw) > _JSON_INLINE_PARSE_LIMIT:
+                # Large JSON is parsed on the worker, just before sending
+                data = raw
+                parse_on_worker = True
             else:
-                # Get message data
-                if data_type == "text_data":
-                    # For text data, use the raw text
-                    data = self.message_data.get(1.0, tk.END)
-                else:
-                    # For JSON data, parse the text as JSON
-                    try:
-                        data = json.loads(self.message_data.get(1.0, tk.END))
-                    except json.JSONDecodeError as e:
-                        print(f"JSON error: {e}")
-                        messagebox.showerror("JSON Error", f"Invalid JSON: {e}")
-                        return
-                
-                # Send message data
-                response = self.client_manager.send_message(
+                # For JSON data, parse the text as JSON
+                try:
+                    data = json.loads(raw)
+                except json.JSONDecodeError as e:
+                    self._show_json_error(e)
+                    return
+            
+            # Send message data
+            def send():
+                payload = json.loads(data) if parse_on_worker else data
+                return self.client_manager.send_message(
                     host=host,
                     port=port,
                     protocol_name=data_type,
-                    data=data
+                    data=payload
                 )
-            
-            if response:
-                messagebox.showinfo("Response", f"Server response received:\n\n{json.dumps(response, indent=2)}")
         
+        # Send off the Tk thread; the result is shown once it arrives
+        future = self._executor.submit(send)
+        future.add_done_callback(self._post_send_done)
+    
+    @staticmethod
+    def _show_json_error(e):
+        """Report message data that is not valid JSON"""
+        print(f"JSON error: {e}")
+        messagebox.showerror("JSON Error", f"Invalid JSON: {e}")
+    
+    def _post_send_done(self, future):
+        """Hand a finished send to the Tk thread (runs on the worker)"""
+        try:
+            self.root.after(0, self._on_send_done, future)
+        except (RuntimeError, tk.TclError):
+            # Window already closed
+            pass
+    
+    def _on_send_done(self, future):
+        """Show the result of a send started by send_message"""
+        try:
+            response = future.result()
+        except json.JSONDecodeError as e:
+            self._show_json_error(e)
+            return
         except Exception as e:
             print(f"Error sending message: {e}")
             messagebox.showerror("Error", f"Error sending message: {e}")
+            return
+        
+        if response:
+            messagebox.showinfo("Response", f"Server response received:\n\n{json.dumps(response, indent=2)}")
     
     def discover_nodes(self):
         """Discover nodes on the network"""
-        nodes = self.discovery_manager.discover_nodes()
-        self.discovered_nodes = nodes
-        self.update_nodes_treeview(nodes)
-        self.refresh_node_dropdown()
+        nodes = self.discovery_manager.discover_nodes(force=True)
+        self._set_discovered_nodes(nodes)
+        self.update_nodes_treeview()
+        self._update_node_dropdown()
     
     def broadcast_presence(self):
         """Broadcast presence on the network"""
@@ -778,13 +1075,19 @@ Tips:
     
     def on_closing(self):
         """Handle the window closing event"""
-        if self.server_manager.server_running:
+        if self.server_manager and self.server_manager.server_running:
             self.server_manager.stop_server()
         
         # Stop background threads
-        self.discovery_manager.stop_auto_discovery()
-        self.discovery_manager.stop_auto_broadcast()
+        if self.discovery_manager:
+            self.discovery_manager.stop_auto_discovery()
+            self.discovery_manager.stop_auto_broadcast()
+        
+        self._executor.shutdown(wait=False)
+        if self.client_manager:
+            self.client_manager.close()
         
-        # Restore stdout
+        # Restore stdout and detach the console log handler
         sys.stdout = self.old_stdout
+        logging.getLogger().removeHandler(self._log_handler)
         self.root.destroy()
\ No newline at end of file
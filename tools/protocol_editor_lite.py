@@ -12,14 +12,16 @@ A simplified version of the protocol editor tool focusing on:
 
 import sys
 import os
-import json
+import orjson
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, scrolledtext
+from collections import Counter
 from datetime import datetime
 
-# Add the project root directory to the path
+# Add the project root directory to the path when run as a script
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-sys.path.insert(0, project_root)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
 # Import witch-core modules
 try:
@@ -28,6 +30,10 @@ except ImportError as e:
     print(f"Error importing witch-core modules: {e}")
     sys.exit(1)
 
+# Labels for the fields tree "Required" column
+_YES = "Yes"
+_NO = "No"
+
 
 class ProtocolEditorLite:
     def __init__(self, root):
@@ -40,6 +46,8 @@ class ProtocolEditorLite:
         self.protocol_data = None
         self.is_modified = False
         self.current_file = None
+        self._preview_dirty = True  # Preview text is out of date with protocol_data
+        self._title_pending = None  # after() id of a scheduled title update
         
         # Protocol variables
         self.protocol_id = tk.StringVar()
@@ -53,6 +61,14 @@ class ProtocolEditorLite:
         self.field_required = tk.BooleanVar(value=True)
         self.field_desc = tk.StringVar()
         
+        # Use counts of the current protocol's field names, for duplicate
+        # checks; loaded protocols may already repeat a name
+        self._field_names = Counter()
+        
+        # Fields tree rows by field name, for incremental updates
+        self._field_iids = {}
+        self._field_values = {}
+        
         # Create menu
         self.create_menu()
         
@@ -73,10 +89,17 @@ class ProtocolEditorLite:
         self.notebook.add(self.fields_tab, text="Data Fields")
         self.notebook.add(self.preview_tab, text="Preview")
         
-        # Set up tabs
+        # Set up the basic info tab; the fields and preview tabs are built
+        # the first time they are selected
         self.setup_basic_info_tab()
-        self.setup_fields_tab()
-        self.setup_preview_tab()
+        self._tab_setup = {
+            str(self.fields_tab): self.setup_fields_tab,
+            str(self.preview_tab): self.setup_preview_tab,
+        }
+        self._tab_ready = set()
+        
+        # Build tabs on demand and refresh the preview only when it is shown
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
         
         # Create button frame
         button_frame = ttk.Frame(self.main_frame)
@@ -117,6 +140,16 @@ class ProtocolEditorLite:
         
         self.root.config(menu=menu_bar)
     
+    def _on_tab_changed(self, event):
+        """Build the selected tab on first selection and refresh the preview"""
+        cur = self.notebook.select()
+        if cur in self._tab_setup and cur not in self._tab_ready:
+            self._tab_setup[cur]()
+            self._tab_ready.add(cur)
+            if cur == str(self.fields_tab):
+                self.update_fields_tree()
+        self._maybe_update_preview()
+    
     def setup_basic_info_tab(self):
         """Set up the basic info tab"""
         frame = self.basic_info_tab
@@ -245,6 +278,7 @@ class ProtocolEditorLite:
                 "encrypt": False
             }
         }
+        self._field_names = Counter()
         
         # Clear form fields
         self.protocol_id.set("")
@@ -253,8 +287,7 @@ class ProtocolEditorLite:
         self.protocol_desc.set("")
         
         # Clear fields tree
-        for item in self.fields_tree.get_children():
-            self.fields_tree.delete(item)
+        self.update_fields_tree()
         
         # Clear field form
         self.field_name.set("")
@@ -263,7 +296,8 @@ class ProtocolEditorLite:
         self.field_desc.set("")
         
         # Update preview
-        self.update_preview()
+        self._preview_dirty = True
+        self._maybe_update_preview()
         
         # Reset modified flag
         self.is_modified = False
@@ -286,12 +320,22 @@ class ProtocolEditorLite:
             return
         
         try:
-            # Load protocol file
-            with open(file_path, "r") as f:
-                data = json.load(f)
+            # Load protocol file; orjson decodes the bytes as UTF-8, matching
+            # what save_protocol writes
+            with open(file_path, "rb") as f:
+                data = orjson.loads(f.read())
+            
+            # Fill in missing field keys once, so the fields tree can
+            # index them directly
+            for field in data.setdefault("fields", []):
+                field.setdefault("name", "")
+                field.setdefault("type", "")
+                field.setdefault("required", False)
+                field.setdefault("description", "")
             
             # Set protocol data
             self.protocol_data = data
+            self._field_names = Counter(field["name"] for field in data["fields"])
             
             # Update form fields
             self.protocol_id.set(data.get("id", ""))
@@ -303,7 +347,8 @@ class ProtocolEditorLite:
             self.update_fields_tree()
             
             # Update preview
-            self.update_preview()
+            self._preview_dirty = True
+            self._maybe_update_preview()
             
             # Set current file and modified flag
             self.current_file = file_path
@@ -346,8 +391,7 @@ class ProtocolEditorLite:
             self.update_protocol_data()
             
             # Write to file
-            with open(file_path, "w") as f:
-                json.dump(self.protocol_data, f, indent=2)
+            self._write_protocol_file(file_path)
             
             # Update state
             self.current_file = file_path
@@ -360,6 +404,18 @@ class ProtocolEditorLite:
             messagebox.showerror("Error", f"Failed to save protocol file: {str(e)}")
             return False
     
+    def _write_protocol_file(self, file_path):
+        """Serialize the protocol once and write it to disk, synced before returning"""
+        buf = memoryview(orjson.dumps(self.protocol_data, option=orjson.OPT_INDENT_2))
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+        fd = os.open(file_path, flags, 0o644)
+        try:
+            while buf:
+                buf = buf[os.write(fd, buf):]
+            getattr(os, "fdatasync", os.fsync)(fd)
+        finally:
+            os.close(fd)
+    
     def update_protocol_data(self):
         """Update protocol data from form fields"""
         self.protocol_data["id"] = self.protocol_id.get()
@@ -391,26 +447,86 @@ class ProtocolEditorLite:
     def mark_modified(self, *args):
         """Mark the protocol as modified"""
         self.is_modified = True
+        self._preview_dirty = True
+        
+        # Coalesce a burst of edits (e.g. typing) into one title update
+        if self._title_pending is None:
+            self._title_pending = self.root.after(50, self._flush_title)
+    
+    def _flush_title(self):
+        """Apply a title update scheduled by mark_modified"""
+        self._title_pending = None
         self.update_title()
     
     def update_fields_tree(self):
         """Update the fields tree with current protocol data"""
-        # Clear tree
-        for item in self.fields_tree.get_children():
-            self.fields_tree.delete(item)
+        if str(self.fields_tab) not in self._tab_ready:
+            return
         
-        # Add fields
         fields = self.protocol_data.get("fields", [])
-        for field in fields:
-            self.fields_tree.insert(
-                "", "end",
-                values=(
-                    field.get("name", ""),
-                    field.get("type", ""),
-                    "Yes" if field.get("required", False) else "No",
-                    field.get("description", "")
-                )
-            )
+        rows = [(field["name"], self._row(field)) for field in fields]
+        names = [name for name, _ in rows]
+        
+        # Rows are matched by field name; start over if the tree holds rows
+        # that aren't tracked
+        children = self.fields_tree.get_children()
+        if len(children) != len(self._field_iids):
+            if children:
+                self.fields_tree.delete(*children)
+            self._field_iids.clear()
+            self._field_values.clear()
+            children = ()
+        
+        # Duplicate names can't be matched: insert every row, tracking only
+        # the last of each name so the next update starts over
+        if len(set(names)) != len(names):
+            if children:
+                self.fields_tree.delete(*children)
+            self._field_iids.clear()
+            self._field_values.clear()
+            for name, values in rows:
+                self._field_iids[name] = self.fields_tree.insert("", "end", values=values)
+                self._field_values[name] = values
+            return
+        
+        # Remove rows of fields that no longer exist
+        new_names = set(names)
+        removed = [name for name in self._field_iids if name not in new_names]
+        if removed:
+            self.fields_tree.delete(*(self._field_iids.pop(name) for name in removed))
+            for name in removed:
+                del self._field_values[name]
+            children = self.fields_tree.get_children()
+        
+        # Only move existing rows if their order changed
+        iid_names = {iid: name for name, iid in self._field_iids.items()}
+        old_order = [iid_names[iid] for iid in children]
+        reorder = old_order != [name for name in names if name in self._field_iids]
+        
+        # Insert new fields and update changed ones
+        for index, (name, values) in enumerate(rows):
+            iid = self._field_iids.get(name)
+            if iid is None:
+                self._field_iids[name] = self.fields_tree.insert("", index, values=values)
+                self._field_values[name] = values
+                continue
+            
+            if values != self._field_values[name]:
+                self.fields_tree.item(iid, values=values)
+                self._field_values[name] = values
+            if reorder:
+                self.fields_tree.move(iid, "", index)
+    
+    @staticmethod
+    def _row(field):
+        """Build the fields tree values for a field"""
+        return (field["name"], field["type"], _YES if field["required"] else _NO, field["description"])
+    
+    def _release_field_name(self, name):
+        """Drop one use of a field name, keeping it taken while other fields use it"""
+        self._field_names[name] -= 1
+        if self._field_names[name] <= 0:
+            del self._field_names[name]
     
     def add_field(self):
         """Add a new field to the protocol"""
@@ -420,10 +536,9 @@ class ProtocolEditorLite:
             return
         
         # Check if field name already exists
-        for field in self.protocol_data.get("fields", []):
-            if field.get("name") == name:
-                messagebox.showerror("Error", f"Field name '{name}' already exists")
-                return
+        if name in self._field_names:
+            messagebox.showerror("Error", f"Field name '{name}' already exists")
+            return
         
         # Create field data
         field_data = {
@@ -438,17 +553,12 @@ class ProtocolEditorLite:
             self.protocol_data["fields"] = []
         
         self.protocol_data["fields"].append(field_data)
+        self._field_names[name] += 1
         
         # Add to tree
-        self.fields_tree.insert(
-            "", "end",
-            values=(
-                field_data["name"],
-                field_data["type"],
-                "Yes" if field_data["required"] else "No",
-                field_data["description"]
-            )
-        )
+        values = self._row(field_data)
+        self._field_iids[name] = self.fields_tree.insert("", "end", values=values)
+        self._field_values[name] = values
         
         # Clear form
         self.field_name.set("")
@@ -477,11 +587,9 @@ class ProtocolEditorLite:
         
         # Check if name changed and conflicts with another field
         old_name = self.protocol_data["fields"][selected_index]["name"]
-        if name != old_name:
-            for i, field in enumerate(self.protocol_data["fields"]):
-                if i != selected_index and field["name"] == name:
-                    messagebox.showerror("Error", f"Field name '{name}' already exists")
-                    return
+        if name != old_name and name in self._field_names:
+            messagebox.showerror("Error", f"Field name '{name}' already exists")
+            return
         
         # Update field data
         field_data = {
@@ -493,17 +601,16 @@ class ProtocolEditorLite:
         
         # Update protocol data
         self.protocol_data["fields"][selected_index] = field_data
+        self._release_field_name(old_name)
+        self._field_names[name] += 1
         
         # Update tree
-        self.fields_tree.item(
-            selected_item,
-            values=(
-                field_data["name"],
-                field_data["type"],
-                "Yes" if field_data["required"] else "No",
-                field_data["description"]
-            )
-        )
+        values = self._row(field_data)
+        self.fields_tree.item(selected_item, values=values)
+        self._field_iids.pop(old_name, None)
+        self._field_values.pop(old_name, None)
+        self._field_iids[name] = selected_item
+        self._field_values[name] = values
         
         # Mark modified
         self.mark_modified()
@@ -520,10 +627,14 @@ class ProtocolEditorLite:
         selected_index = self.fields_tree.index(selected_item)
         
         # Remove from protocol data
-        del self.protocol_data["fields"][selected_index]
+        old_name = self.protocol_data["fields"].pop(selected_index)["name"]
+        self._release_field_name(old_name)
         
         # Remove from tree
         self.fields_tree.delete(selected_item)
+        if self._field_iids.get(old_name) == selected_item:
+            del self._field_iids[old_name]
+            del self._field_values[old_name]
         
         # Mark modified
         self.mark_modified()
@@ -553,11 +664,16 @@ class ProtocolEditorLite:
         self.update_protocol_data()
         
         # Format preview
-        preview = json.dumps(self.protocol_data, indent=2)
+        preview = orjson.dumps(self.protocol_data, option=orjson.OPT_INDENT_2).decode("utf-8")
         
         # Update preview text
-        self.preview_text.delete(1.0, tk.END)
-        self.preview_text.insert(tk.END, preview)
+        self.preview_text.replace("1.0", tk.END, preview)
+        self._preview_dirty = False
+    
+    def _maybe_update_preview(self, event=None):
+        """Update the preview if it is out of date and its tab is shown"""
+        if self._preview_dirty and self.notebook.select() == str(self.preview_tab):
+            self.update_preview()
     
     def list_protocols(self):
         """List all available protocols"""
@@ -611,8 +727,7 @@ class ProtocolEditorLite:
         
         try:
             # Write to file
-            with open(file_path, "w") as f:
-                json.dump(self.protocol_data, f, indent=2)
+            self._write_protocol_file(file_path)
             
             messagebox.showinfo("Success", f"Protocol exported to: {file_path}")
         except Exception as e:
@@ -626,6 +741,8 @@ class ProtocolEditorLite:
             elif not self.save_protocol():
                 return
         
+        if self._title_pending is not None:
+            self.root.after_cancel(self._title_pending)
         self.root.destroy()
 
 